@@ -4,20 +4,32 @@ This module provides a `commit` click command which (eventually)
 generates a commit message based on staged changes.
 """
 
+import os
 import subprocess
+import sys
 import click
 import logging
-from typing import Any
-from litellm import completion
-from litellm.exceptions import AuthenticationError
+import re
+from fnmatch import fnmatch
+from functools import lru_cache
+from pathlib import PurePosixPath
+from typing import Any, Optional
 from git import InvalidGitRepositoryError, GitCommandError
 
-from .. import git_utils
+from .. import diff_utils, git_utils, llm_cache
+from ..llm_utils import (
+    cacheable_message,
+    completion,
+    is_authentication_error,
+)
 
 # Set up module logger
 logger = logging.getLogger(__name__)
 
-COMMIT_MESSAGE_PROMPT_TEMPLATE = """You are an expert software developer tasked with generating a concise and informative commit message based on the provided git diff.
+# Static instructions, sent as the system message. Keeping them in a
+# message of their own makes them a byte-identical prefix across every
+# request, which providers with prefix caching can reuse.
+COMMIT_SYSTEM_PROMPT = """You are an expert software developer tasked with generating a concise and informative commit message based on the provided git diff.
 
 **Instructions:**
 1. Follow the Conventional Commits specification (https://www.conventionalcommits.org/)
@@ -42,9 +54,10 @@ COMMIT_MESSAGE_PROMPT_TEMPLATE = """You are an expert software developer tasked
 - First line: commit title following conventional commits
 - Afterwards, a blank line followed by commit body with additional details
 - Return only the commit message text, no extra formatting or explanations
-- In case of a breaking change, please add BREAKING CHANGE: <description> in the commit body
+- In case of a breaking change, please add BREAKING CHANGE: <description> in the commit body"""
 
-**Git diff to analyze:**
+# Per-request user message carrying the staged diff.
+COMMIT_USER_PROMPT_TEMPLATE = """**Git diff to analyze:**
 
 <diff>
 {diff}
@@ -52,13 +65,294 @@ COMMIT_MESSAGE_PROMPT_TEMPLATE = """You are an expert software developer tasked
 
 Generate an appropriate commit message based on the changes shown in the diff above."""
 
+# The complete prompt as a single template (system instructions followed by
+# the diff message).
+COMMIT_MESSAGE_PROMPT_TEMPLATE = (
+    f"{COMMIT_SYSTEM_PROMPT}\n\n{COMMIT_USER_PROMPT_TEMPLATE}"
+)
+
+# The user template is split around its only placeholder once at import
+# time so building a prompt is a plain join instead of a str.format pass
+# over the template (and the potentially large diff).
+_PROMPT_PREFIX, _PROMPT_SUFFIX = COMMIT_USER_PROMPT_TEMPLATE.split(
+    "{diff}"
+)
+
+# Number of alternative commit messages requested per LLM call. All
+# candidates are decoded from a single prompt, so asking for several costs
+# one round-trip instead of one per "Adjust" iteration. Providers that do
+# not support ``n`` fall back to a single candidate (``drop_params``).
+COMMIT_CANDIDATES = 3
+
+# Diff size limits applied before the diff is placed into the prompt. Prompt
+# processing cost grows with input length, and a commit message rarely needs
+# more than the first couple of thousand characters of each file's changes.
+MAX_DIFF_CHARS = 12000
+MAX_FILE_DIFF_CHARS = 2000
+
+# Generated or vendored files whose diffs are noise for a commit message.
+# They are still listed in the condensed diff, just without their hunks.
+CONDENSE_DENYLIST = (
+    "*.lock",
+    "package-lock.json",
+    "*.min.js",
+    "poetry.lock",
+)
+
+# Dependency manifests: a diff touching only these (or lockfiles) is
+# classified locally as a dependency update.
+DEPENDENCY_FILES = frozenset(
+    {
+        "pyproject.toml",
+        "requirements.txt",
+        "requirements-dev.txt",
+        "package.json",
+        "package-lock.json",
+    }
+)
+
+# Files that declare a package version: a diff that only changes version
+# strings in these is classified locally as a version bump.
+VERSION_FILES = frozenset(
+    {
+        "pyproject.toml",
+        "setup.cfg",
+        "package.json",
+        "__init__.py",
+        "_version.py",
+    }
+)
+
+# Streamed deltas are written straight to stdout and flushed at each
+# newline or after this many deltas, whichever comes first
+STREAM_FLUSH_EVERY = 8
+
+# Menu actions after the candidate entries; a selection beyond the
+# candidates indexes into this tuple
+_ACTIONS = ("approve", "adjust", "abort")
+
+# llm_cache namespace for generated commit messages, keyed by model,
+# prompt template and staged diff; entries expire after a week
+COMMIT_CACHE_NAMESPACE = "commit"
+COMMIT_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Digest of the prompt template, hashed once at import so each cache
+# lookup only hashes the model id and the diff
+_PROMPT_DIGEST = llm_cache.make_key(COMMIT_MESSAGE_PROMPT_TEMPLATE)
+
+# Added/removed version assignment as found in pyproject.toml, setup.cfg,
+# package.json or ``__version__ = "..."``; group 1 is the version
+_VERSION_LINE_RE = re.compile(
+    r"""^[+-]\s*"?(?:__version__|version)"?\s*[=:]\s*["']([^"']+)["'],?\s*$"""
+)
+
+
+@lru_cache(maxsize=8)
+def _diff_for_index(repo_path: str, fingerprint: str) -> str:
+    """Return the staged diff of ``repo_path`` in the state ``fingerprint``.
+
+    The pair is the cache key: repeated lookups for an unchanged index of
+    the same repository reuse the previous diff instead of spawning
+    ``git diff --staged`` again, and two repositories never share an
+    entry. The cache is cleared after a successful commit.
+    """
+    logger.debug(
+        "Reading staged diff for %s at %s", repo_path, fingerprint
+    )
+    return git_utils.get_diff(staged=True, path=repo_path)
+
+
+def _read_staged_diff() -> str:
+    """Return the staged diff, reusing a cached copy when the index is unchanged."""
+    repo_path = os.path.abspath(".")
+    try:
+        fingerprint = git_utils.get_staged_fingerprint(repo_path)
+    except Exception as e:
+        # Fingerprinting is best-effort; let get_diff surface real git errors
+        logger.debug("Could not fingerprint staged state: %s", e)
+        return git_utils.get_diff(staged=True, path=repo_path)
+    return _diff_for_index(repo_path, fingerprint)
+
+
+def _truncate_lines(text: str, limit: int) -> str:
+    """Cut ``text`` to at most ``limit`` characters on a line boundary.
+
+    A trailing ``... (N more lines truncated)`` marker tells the LLM that
+    content was dropped.
+    """
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    if cut <= 0:
+        cut = limit
+    omitted = text.count("\n", cut)
+    return f"{text[:cut]}\n... ({omitted} more lines truncated)"
+
+
+def _is_blank(text: str) -> bool:
+    """Return True if ``text`` is empty or contains only whitespace.
+
+    ``str.isspace`` stops at the first non-whitespace character, which
+    for a real diff is the leading ``d`` of ``diff --git``; unlike
+    ``text.strip()`` it never copies a potentially huge diff.
+    """
+    return not text or text.isspace()
+
+
+def _diff_stat(sections: list[tuple[str, str]]) -> str:
+    """Summarize file sections like ``git diff --stat``.
+
+    Lists every file with its added/removed line counts so the LLM still
+    sees the full scope of a change whose hunks were condensed away.
+    """
+    lines = ["Changed files (diff below is condensed):"]
+    for path, section in sections:
+        if not path:
+            continue
+        added = removed = 0
+        for line in section.split("\n"):
+            if line.startswith("+") and not line.startswith("+++ "):
+                added += 1
+            elif line.startswith("-") and not line.startswith("--- "):
+                removed += 1
+        lines.append(f" {path} | +{added} -{removed}")
+    return "\n".join(lines)
+
+
+def _condense_diff(
+    diff: str, max_chars: int = MAX_DIFF_CHARS
+) -> str:
+    """Shrink a unified diff so the commit prompt stays bounded.
+
+    The diff is split into per-file sections. Files matching
+    ``CONDENSE_DENYLIST`` keep only their header line, every other file is
+    truncated to ``MAX_FILE_DIFF_CHARS`` and the result is hard-capped at
+    ``max_chars``. Whenever anything is dropped, a per-file summary (see
+    ``_diff_stat``) is put in front so files cut by the overall cap are
+    still listed.
+
+    Args:
+        diff: Unified diff text as returned by ``git diff``.
+        max_chars: Upper bound for the returned text (plus a short marker).
+
+    Returns:
+        The condensed diff; small diffs are returned unchanged.
+    """
+    sections = list(diff_utils.iter_file_sections(diff))
+    condensed: list[str] = []
+    for path, section in sections:
+        if path and any(
+            fnmatch(path, pattern) for pattern in CONDENSE_DENYLIST
+        ):
+            header, _, _ = section.partition("\n")
+            condensed.append(
+                f"{header}\n... (diff omitted for generated file)"
+            )
+            continue
+        condensed.append(
+            _truncate_lines(section, MAX_FILE_DIFF_CHARS)
+        )
+
+    body = "\n".join(condensed)
+    if len(body) <= max_chars and body == diff:
+        return diff
+
+    stat = _truncate_lines(_diff_stat(sections), max_chars // 2)
+    body_budget = max(max_chars - len(stat) - 2, 0)
+    return f"{stat}\n\n{_truncate_lines(body, body_budget)}"
+
+
+def _diff_files(diff: str) -> list[tuple[str, str]]:
+    """Return ``(path, change)`` pairs for each file in a unified diff.
+
+    ``change`` is ``"add"``, ``"remove"`` or ``"update"`` depending on the
+    file mode lines that follow the ``diff --git`` header.
+    """
+    files: list[tuple[str, str]] = []
+    for match in diff_utils.DIFF_HEADER_RE.finditer(diff):
+        body_start = match.end() + 1
+        change = "update"
+        if diff.startswith("new file mode", body_start):
+            change = "add"
+        elif diff.startswith("deleted file mode", body_start):
+            change = "remove"
+        files.append((match.group(1), change))
+    return files
+
+
+def _version_bump(diff: str) -> Optional[str]:
+    """Return the new version if ``diff`` only changes version strings.
+
+    Every added or removed line must be a version assignment (see
+    ``_VERSION_LINE_RE``); the scan stops at the first line that isn't.
+    """
+    new_version = None
+    for line in diff.split("\n"):
+        if not line.startswith(("+", "-")) or line.startswith(
+            ("+++ ", "--- ")
+        ):
+            continue
+        match = _VERSION_LINE_RE.match(line)
+        if match is None:
+            return None
+        if line.startswith("+"):
+            new_version = match.group(1)
+    return new_version
+
+
+def _fast_classify(diff: str) -> Optional[str]:
+    """Propose a commit message for trivially classifiable diffs.
+
+    Some staged changes can be described without an LLM round-trip:
+    documentation-only edits (``docs/`` or Markdown files), version bumps
+    (only version strings in ``VERSION_FILES`` change), dependency manifest updates
+    (``pyproject.toml``, requirement and lock files) and test-only changes
+    (``tests/``). For those a Conventional Commits title is derived from
+    the file list.
+
+    Args:
+        diff: Unified diff text of the staged changes.
+
+    Returns:
+        A commit message title, or None when the diff needs the LLM.
+    """
+    files = _diff_files(diff)
+    if not files:
+        return None
+
+    paths = [PurePosixPath(path) for path, _ in files]
+    if len(files) == 1:
+        path, change = files[0]
+        subject = f"{change} {PurePosixPath(path).stem}"
+    else:
+        subject = None
+
+    if all(
+        p.parts[0] == "docs" or p.suffix == ".md" for p in paths
+    ):
+        return f"docs: {subject or 'update documentation'}"
+    if all(p.name in VERSION_FILES for p in paths) and (
+        new_version := _version_bump(diff)
+    ):
+        return f"chore: bump version to {new_version}"
+    if all(
+        p.name in DEPENDENCY_FILES or p.suffix == ".lock"
+        for p in paths
+    ):
+        return "chore(deps): update dependencies"
+    if all(p.parts[0] == "tests" for p in paths):
+        return f"test: {subject or 'update tests'}"
+    return None
+
 
 def get_staged_diff() -> str:
     """Retrieve the staged git diff for the current repository.
 
     Returns the unified diff string for files staged for commit. This is a
     thin wrapper around ``ai_toolbox.git_utils.get_diff(staged=True)`` and
-    preserves the same exceptions from GitPython/Git.
+    preserves the same exceptions from GitPython/Git. Diffs are cached per
+    staged state (see ``git_utils.get_staged_fingerprint``) so repeated
+    calls for an unchanged index do not shell out to git again.
 
     Returns:
         The staged unified diff as a string (may be empty).
@@ -70,47 +364,414 @@ def get_staged_diff() -> str:
         "Starting to retrieve staged git diff via git_utils"
     )
     try:
-        diff_text = git_utils.get_diff(staged=True)
+        diff_text = _read_staged_diff()
         diff_length = len(diff_text)
         logger.debug(
-            f"Successfully retrieved git diff, length: {diff_length} characters"
+            "Successfully retrieved git diff, length: %d characters",
+            diff_length,
         )
 
         if diff_length == 0:
             logger.info("No staged changes found in git diff")
         else:
             logger.info(
-                f"Retrieved staged diff with {diff_length} characters"
+                "Retrieved staged diff with %d characters",
+                diff_length,
             )
 
         return diff_text
     # TODO: Probably we can get rid of this exception handling
     except subprocess.CalledProcessError as e:
-        logger.error(f"Git diff command failed: {e}")
+        logger.error("Git diff command failed: %s", e)
         # Re-raise to preserve previous behavior
         raise
     except FileNotFoundError as e:
-        logger.error(f"Git command not found: {e}")
+        logger.error("Git command not found: %s", e)
         raise
 
 
+def _load_cached_candidates(cache_key: str) -> list[str]:
+    """Return previously generated candidates for ``cache_key``, if any."""
+    entry = llm_cache.load(
+        COMMIT_CACHE_NAMESPACE, cache_key, max_age=COMMIT_CACHE_TTL
+    )
+    if not isinstance(entry, dict):
+        return []
+    candidates = entry.get("candidates")
+    if not isinstance(candidates, list) or not all(
+        isinstance(candidate, str) and candidate
+        for candidate in candidates
+    ):
+        return []
+    return candidates
+
+
+def _store_cached_candidates(
+    cache_key: str, candidates: list[str]
+) -> None:
+    """Remember ``candidates`` as the messages for ``cache_key``."""
+    llm_cache.store(
+        COMMIT_CACHE_NAMESPACE, cache_key, {"candidates": candidates}
+    )
+
+
+def _action_labels(candidate_count: int) -> list[str]:
+    """Return the menu labels offered for ``candidate_count`` generated messages.
+
+    With a single candidate the classic Approve/Adjust/Abort menu is shown;
+    with several, each candidate gets its own entry followed by Adjust and
+    Abort. The first entry is always the default.
+    """
+    if candidate_count == 1:
+        labels = ["Approve"]
+    else:
+        labels = [
+            f"Use candidate {i}"
+            for i in range(1, candidate_count + 1)
+        ]
+    labels[0] += " (default)"
+    return labels + ["Adjust", "Abort"]
+
+
+def _collect_streamed_candidates(
+    response: Any, echo: bool = True
+) -> list[str]:
+    """Consume a streaming completion and return the generated candidates.
+
+    Deltas belonging to the first candidate are echoed immediately (unless
+    ``echo`` is False) so the user sees the message as it is decoded;
+    deltas for the other candidates (``n > 1``) are only buffered.
+    Candidates are returned stripped, in choice-index order, and at least
+    one (possibly empty) candidate is always returned.
+
+    Echoed deltas bypass ``click.echo``: they are written to stdout
+    directly and flushed every ``STREAM_FLUSH_EVERY`` deltas or at a
+    newline, which keeps per-token overhead out of the streaming loop.
+    """
+    buffers: dict[int, list[str]] = {}
+    stdout = sys.stdout
+    write = stdout.write
+    pending = 0
+    for chunk in response:
+        for choice in chunk.choices:
+            delta = choice.delta.content or ""
+            if not delta:
+                continue
+            buffers.setdefault(choice.index, []).append(delta)
+            if echo and choice.index == 0:
+                write(delta)
+                pending += 1
+                if pending >= STREAM_FLUSH_EVERY or "\n" in delta:
+                    stdout.flush()
+                    pending = 0
+    if pending:
+        stdout.flush()
+
+    candidates = [
+        "".join(buffers[index]).strip()
+        for index in sorted(buffers)
+    ]
+    return candidates or [""]
+
+
+def _generate_candidates(
+    model: str,
+    messages: list[dict[str, Any]],
+    count: int,
+    echo: bool = True,
+) -> list[str]:
+    """Ask the LLM for ``count`` commit message candidates in one call."""
+    logger.debug(
+        "Calling LLM completion with %d messages using model %s",
+        len(messages),
+        model,
+    )
+    response: Any = completion(
+        model=model,
+        messages=messages,
+        n=count,
+        drop_params=True,
+        stream=True,
+    )
+    candidates = _collect_streamed_candidates(response, echo=echo)
+    logger.info(
+        "Generated %d commit message candidate(s): %r",
+        len(candidates),
+        candidates,
+    )
+    return candidates
+
+
+def _format_candidates(candidates: list[str]) -> str:
+    """Summarize candidates as one assistant turn for the Adjust loop.
+
+    Only each candidate's title (first line) is kept: the follow-up request
+    needs to know what was proposed, not the full bodies, and a shorter
+    turn keeps the re-sent conversation small.
+    """
+    titles = [
+        candidate.partition("\n")[0] for candidate in candidates
+    ]
+    if len(titles) == 1:
+        return titles[0]
+    return "\n\n".join(
+        f"Candidate {i}:\n{title}"
+        for i, title in enumerate(titles, start=1)
+    )
+
+
+def _build_commit_prompt(staged_diff: str) -> str:
+    """Return the user prompt for ``staged_diff``, condensed to fit."""
+    prompt_diff = _condense_diff(staged_diff)
+    if len(prompt_diff) != len(staged_diff):
+        logger.info(
+            "Condensed staged diff from %d to %d characters",
+            len(staged_diff),
+            len(prompt_diff),
+        )
+
+    logger.debug("Formatting commit prompt template with diff")
+    commit_prompt = "".join((_PROMPT_PREFIX, prompt_diff, _PROMPT_SUFFIX))
+    logger.debug(
+        "Generated commit prompt with %d characters",
+        len(commit_prompt),
+    )
+    return commit_prompt
+
+
+def _initial_candidates(
+    staged_diff: str, cache_key: str, no_cache: bool, no_interactive: bool
+) -> list[str]:
+    """Return the messages to propose before any LLM call, possibly none.
+
+    Trivial diffs get a locally derived message and staged changes seen
+    before reuse the messages generated for them; the LLM is only
+    consulted if the user asks to adjust those. An empty list means the
+    candidates still have to be generated.
+    """
+    fast_message = _fast_classify(staged_diff)
+    if fast_message:
+        logger.info("Classified diff locally as: %r", fast_message)
+        if not no_interactive:
+            click.echo(
+                "⚡ Recognized a routine change, proposing a message without the LLM."
+            )
+        return [fast_message]
+    if not no_cache and (cached := _load_cached_candidates(cache_key)):
+        logger.info(
+            "Reusing %d cached commit message candidate(s)",
+            len(cached),
+        )
+        if not no_interactive:
+            click.echo(
+                "💾 Reusing the commit message generated earlier for these staged changes."
+            )
+        return cached
+    if not no_interactive:
+        # Inform the user we're generating the commit message
+        click.echo("🤖 Generating commit message, please hold...")
+    return []
+
+
+def _choose_action(candidates: list[str]) -> tuple[str, int]:
+    """Show the remaining candidates and the action menu; read a choice.
+
+    The first candidate has already been printed. Candidates come first in
+    the menu (default: the first one), then Adjust and Abort.
+
+    Returns:
+        The chosen ``_ACTIONS`` entry and the 1-based menu selection.
+    """
+    labels = _action_labels(len(candidates))
+    lines = [
+        f"\n----- Candidate {index} -----\n{candidate}"
+        for index, candidate in enumerate(candidates[1:], start=2)
+    ]
+    lines.append("----- End commit message -----\n")
+    lines.append("Choose one of the following actions:\n")
+    lines.extend(
+        f"{number}) {label}"
+        for number, label in enumerate(labels, start=1)
+    )
+    # Remaining candidates and the numeric choices in a single write
+    click.echo("\n".join(lines))
+
+    logger.debug("Prompting user for action selection")
+    selection = click.prompt(
+        "Choose an action",
+        type=click.IntRange(1, len(labels)),
+        default=1,
+        show_default=True,
+    )
+    choice = _ACTIONS[max(selection - len(candidates), 0)]
+    logger.info("User selected action: %s", choice)
+    return choice, selection
+
+
+def _commit_with_message(message: str, cache_key: str) -> None:
+    """Create the commit with the approved ``message`` and report the outcome."""
+    logger.info("User approved commit message, proceeding with git commit")
+    try:
+        logger.debug(
+            "Executing git commit via git_utils with message: %r",
+            message,
+        )
+        git_utils.run_commit(message)
+        # Retrying these staged changes (e.g. after an amend or reset)
+        # proposes the approved message
+        _store_cached_candidates(cache_key, [message])
+        # The index now matches HEAD; drop cached diffs
+        _diff_for_index.cache_clear()
+        logger.info("Git commit executed successfully")
+        click.echo("✅ Commit created successfully.")
+    except subprocess.CalledProcessError as e:
+        logger.error(
+            "Git commit failed with return code %d: %s",
+            e.returncode,
+            e.stderr,
+        )
+        click.echo(f"Error committing changes: {e.stderr}", err=True)
+
+
+def _run_interactive(
+    model: str,
+    system_message: dict,
+    prompt_message: dict,
+    candidates: list[str],
+    cache_key: str,
+) -> None:
+    """Run the approve/adjust/abort loop until a commit is made or aborted.
+
+    Each round shows the candidates (generating and streaming them first
+    when ``candidates`` is empty) and acts on the user's choice. Adjust
+    rounds resend only the system and diff messages plus the latest
+    exchange; ``history`` keeps the full conversation for logging.
+
+    Args:
+        model: LLM model id.
+        system_message: The cacheable system instructions.
+        prompt_message: The cacheable diff-bearing user message.
+        candidates: Messages to propose first (local or cached), or empty.
+        cache_key: ``llm_cache`` key of these staged changes.
+    """
+    messages = [system_message, prompt_message]
+    history = [system_message, prompt_message]
+    iteration_count = 0
+    while True:
+        iteration_count += 1
+        logger.debug(
+            "Starting commit generation iteration %d",
+            iteration_count,
+        )
+
+        if candidates:
+            click.echo(
+                "\n----- Generated commit message -----\n"
+                f"{candidates[0]}"
+            )
+        else:
+            # Stream the first candidate to the terminal as tokens
+            # arrive; further candidates are collected and shown after.
+            click.echo("\n----- Generated commit message -----")
+            candidates = _generate_candidates(
+                model, messages, COMMIT_CANDIDATES
+            )
+            click.echo()
+            logger.debug("Successfully received LLM response")
+
+            # Only answers to the unadjusted prompt are reusable
+            if len(history) == 2 and all(candidates):
+                _store_cached_candidates(cache_key, candidates)
+
+        choice, selection = _choose_action(candidates)
+        match choice:
+            case "approve":
+                _commit_with_message(candidates[selection - 1], cache_key)
+                return
+
+            case "abort":
+                logger.info("User aborted commit generation")
+                click.echo("Aborted...")
+                return
+
+            case "adjust":
+                logger.info("User requested adjustment to commit message")
+                # Summarize the assistant's last candidates and ask the user for adjustment
+                assistant_turn = {
+                    "role": "assistant",
+                    "content": _format_candidates(candidates),
+                }
+                adjustment = click.prompt(
+                    "Describe the changes you'd like to make to the commit message",
+                )
+                logger.info(
+                    "User provided adjustment feedback: %r",
+                    adjustment,
+                )
+
+                # Resend only the prompt plus the latest exchange
+                user_turn = {"role": "user", "content": adjustment}
+                history.extend([assistant_turn, user_turn])
+                messages = [
+                    system_message,
+                    prompt_message,
+                    assistant_turn,
+                    user_turn,
+                ]
+                logger.debug(
+                    "Added adjustment to conversation history. Total messages: %d",
+                    len(history),
+                )
+
+                # Inform about generation and continue loop to regenerate
+                click.echo(
+                    "🤖 Regenerating commit message with your feedback..."
+                )
+                candidates = []
+
+
 @click.command()
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Ignore messages cached for these staged changes and ask the LLM again.",
+)
+@click.option(
+    "--no-interactive",
+    is_flag=True,
+    envvar="AI_TOOLBOX_NO_INTERACTIVE",
+    help="Print a single commit message and exit without prompting or committing.",
+)
 @click.pass_context
-def commit(ctx: click.Context) -> None:
+def commit(
+    ctx: click.Context, no_cache: bool, no_interactive: bool
+) -> None:
     """Interactive commit message generator using an LLM.
 
     Flow summary:
     1. Retrieves staged diff via ``get_staged_diff``.
     2. If no staged changes exist, informs the user and exits.
-    3. Formats a Conventional Commits prompt and calls the LLM to generate
-       a commit message.
-    4. Presents the generated message and lets the user Approve, Adjust or Abort.
-       - Approve: runs ``ai_toolbox.git_utils.run_commit`` with the generated message.
+       Routine diffs (docs-only, dependency-only, tests-only) get a locally
+       derived message via ``_fast_classify`` and skip the first LLM call.
+    3. Formats a Conventional Commits prompt and calls the LLM once to generate
+       up to ``COMMIT_CANDIDATES`` alternative commit messages, streaming the
+       first one to the terminal as it is generated.
+       Messages generated earlier for the same model, prompt and diff are
+       reused from the on-disk cache (``ai_toolbox.llm_cache``) instead.
+       With ``--no-interactive`` only the first message is printed (no
+       streaming display, menu or commit), e.g. for
+       ``git commit -m "$(ai-toolbox commit --no-interactive)"``.
+    4. Presents the candidates and lets the user pick one, Adjust or Abort.
+       - Approve / Use candidate N: runs ``ai_toolbox.git_utils.run_commit`` with that message.
        - Adjust: prompts the user for feedback, appends it to the LLM conversation and regenerates.
        - Abort: exits without committing.
 
     Args:
         ctx: Click context - expects ``ctx.obj['model']`` to contain the LLM model id.
+        no_cache: Skip the cache lookup; freshly generated messages still
+            replace the cached entry.
+        no_interactive: Print one message for scripting instead of running
+            the interactive flow.
 
     Errors & side effects:
         - May raise/catch GitPython exceptions when reading diffs or committing.
@@ -121,190 +782,77 @@ def commit(ctx: click.Context) -> None:
 
     # Get model from context
     model = ctx.obj.get("model", "openai/gpt-4o-mini")
-    logger.debug(f"Using model for commit command: {model}")
+    logger.debug("Using model for commit command: %s", model)
 
     try:
         logger.debug("Retrieving staged changes from git")
         staged_diff = get_staged_diff()
 
-        if not staged_diff.strip():
+        if _is_blank(staged_diff):
             logger.warning(
                 "No staged changes found - aborting commit generation"
             )
             click.echo(
-                "No staged changes found. Please stage some changes before generating a commit message."
+                "No staged changes found. Please stage some changes before generating a commit message.",
+                err=no_interactive,
             )
             return
 
         logger.info(
             "Staged changes found, preparing commit message generation"
         )
-        logger.debug(
-            "Formatting commit prompt template with diff"
-        )
-        commit_prompt = COMMIT_MESSAGE_PROMPT_TEMPLATE.format(
-            diff=staged_diff
-        )
+        commit_prompt = _build_commit_prompt(staged_diff)
 
-        # Log prompt length for debugging
-        prompt_length = len(commit_prompt)
-        logger.debug(
-            f"Generated commit prompt with {prompt_length} characters"
+        # The system instructions are identical across invocations and the
+        # diff message across Adjust rounds, so providers can reuse their
+        # processed prefix.
+        system_message = cacheable_message(
+            "system", COMMIT_SYSTEM_PROMPT, model
         )
-
-        # Prepare the LLM messages history; we'll append assistant/user turns on adjust
-        messages = [{"role": "user", "content": commit_prompt}]
+        prompt_message = cacheable_message("user", commit_prompt, model)
+        messages = [system_message, prompt_message]
         logger.debug(
-            f"Initialized conversation with {len(messages)} message(s)"
+            "Initialized conversation with %d message(s)",
+            len(messages),
         )
 
-        # Inform the user we're generating the commit message
-        click.echo(
-            "🤖 Generating commit message, please hold..."
+        cache_key = llm_cache.make_key(model, _PROMPT_DIGEST, staged_diff)
+        candidates = _initial_candidates(
+            staged_diff, cache_key, no_cache, no_interactive
         )
 
         try:
-            iteration_count = 0
-            while True:
-                iteration_count += 1
-                logger.debug(
-                    f"Starting commit generation iteration {iteration_count}"
-                )
-
-                # Call the LLM to generate the commit message
-                logger.debug(
-                    f"Calling LLM completion with {len(messages)} messages using model {model}"
-                )
-                response: Any = completion(
-                    model=model,
-                    messages=messages,
-                )
-                logger.debug(
-                    "Successfully received LLM response"
-                )
-
-                # Extract generated content (assumes non-streaming response)
-                generated_message = (
-                    response.choices[0].message.content or ""
-                ).strip()
-
-                logger.info(
-                    f"Generated commit message: {repr(generated_message)}"
-                )
-                logger.debug(
-                    f"Message length: {len(generated_message)} characters"
-                )
+            if no_interactive:
+                # Scripting mode: one message on stdout, nothing else
+                if not candidates:
+                    candidates = _generate_candidates(
+                        model, messages, 1, echo=False
+                    )
+                    if all(candidates):
+                        _store_cached_candidates(cache_key, candidates)
+                click.echo(candidates[0])
+                return
 
-                # Display generated message inside a clear formatted block
-                click.echo(
-                    "\n----- Generated commit message -----"
-                )
-                click.echo(generated_message)
-                click.echo("----- End commit message -----\n")
+            _run_interactive(
+                model, system_message, prompt_message, candidates, cache_key
+            )
 
-                # Offer numeric choices to the user (default: Approve)
+        except Exception as e:
+            if is_authentication_error(e):
+                logger.error("LLM authentication failed: %s", e)
                 click.echo(
-                    "Choose one of the following actions:\n"
+                    "Authentication failed. Please check your API key.",
+                    err=True,
                 )
-                click.echo("1) Approve (default)")
-                click.echo("2) Adjust")
-                click.echo("3) Abort")
-
-                logger.debug(
-                    "Prompting user for action selection"
+            else:
+                logger.error(
+                    "Error during LLM interaction: %s",
+                    e,
+                    exc_info=True,
                 )
-                selection = click.prompt(
-                    "Choose an action",
-                    type=click.IntRange(1, 3),
-                    default=1,
-                    show_default=True,
+                click.echo(
+                    f"Error generating commit message: {e}", err=True
                 )
-                choice = {1: "approve", 2: "adjust", 3: "abort"}[
-                    selection
-                ]
-                logger.info(f"User selected action: {choice}")
-
-                if choice.lower() == "approve":
-                    logger.info(
-                        "User approved commit message, proceeding with git commit"
-                    )
-                    try:
-                        logger.debug(
-                            f"Executing git commit via git_utils with message: {repr(generated_message)}"
-                        )
-                        git_utils.run_commit(generated_message)
-                        logger.info(
-                            "Git commit executed successfully"
-                        )
-                        click.echo(
-                            "✅ Commit created successfully."
-                        )
-                    except subprocess.CalledProcessError as e:
-                        logger.error(
-                            f"Git commit failed with return code {e.returncode}: {e.stderr}"
-                        )
-                        click.echo(
-                            f"Error committing changes: {e.stderr}",
-                            err=True,
-                        )
-                    return
-
-                if choice.lower() == "abort":
-                    logger.info("User aborted commit generation")
-                    click.echo("Aborted...")
-                    return
-
-                # If user chose Adjust, collect feedback and loop
-                if choice.lower() == "adjust":
-                    logger.info(
-                        "User requested adjustment to commit message"
-                    )
-                    # Save the assistant's last message and ask the user for adjustment
-                    messages.append(
-                        {
-                            "role": "assistant",
-                            "content": generated_message,
-                        }
-                    )
-                    logger.debug(
-                        "Added assistant message to conversation history"
-                    )
-
-                    adjustment = click.prompt(
-                        "Describe the changes you'd like to make to the commit message",
-                    )
-                    logger.info(
-                        f"User provided adjustment feedback: {repr(adjustment)}"
-                    )
-
-                    # Append the user's adjustment request to the conversation
-                    messages.append(
-                        {"role": "user", "content": adjustment}
-                    )
-                    logger.debug(
-                        f"Added user adjustment to conversation history. Total messages: {len(messages)}"
-                    )
-
-                    # Inform about generation and continue loop to regenerate
-                    click.echo(
-                        "🤖 Regenerating commit message with your feedback..."
-                    )
-                    continue
-
-        except AuthenticationError as e:
-            logger.error(f"LLM authentication failed: {e}")
-            click.echo(
-                "Authentication failed. Please check your API key.",
-                err=True,
-            )
-        except Exception as e:
-            logger.error(
-                f"Error during LLM interaction: {e}",
-                exc_info=True,
-            )
-            click.echo(
-                f"Error generating commit message: {e}", err=True
-            )
 
     except (
         subprocess.CalledProcessError,
@@ -312,8 +860,8 @@ def commit(ctx: click.Context) -> None:
         GitCommandError,
     ) as e:
         # Handle both subprocess-based errors and GitPython exceptions
-        logger.error(f"Git command error: {e}")
+        logger.error("Git command error: %s", e)
         click.echo(f"Error running git command: {e}", err=True)
     except FileNotFoundError as e:
-        logger.error(f"Git not found error: {e}")
+        logger.error("Git not found error: %s", e)
         click.echo(f"Error: {e}", err=True)
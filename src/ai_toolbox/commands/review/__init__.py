@@ -1,6 +1,7 @@
 from .helpers import (
     analyze_logic,
     analyze_syntax,
+    run_batched_persona_review,
     run_review_pipeline,
     run_reviews_with_personas,
     synthesize_perspectives,
@@ -8,6 +9,7 @@ from .helpers import (
 )
 
 from .prompts import (
+    BATCHED_PERSONA_REVIEW_TEMPLATE,
     SYNTAX_REVIEW_TEMPLATE,
     LOGIC_REVIEW_TEMPLATE,
     PERFORMANCE_REVIEW_TEMPLATE,
@@ -26,12 +26,38 @@ logger = logging.getLogger(__name__)
     default=None,
     help="Optional path to write the output to (file will be overwritten).",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Ignore review replies cached for the same diff and ask the LLM again.",
+)
+@click.option(
+    "--self-critique/--no-self-critique",
+    default=False,
+    help=(
+        "Add a final LLM pass that critiques and polishes the synthesized "
+        "report. Off by default: it rarely changes the findings but adds "
+        "one of the largest calls to the pipeline's time and cost."
+    ),
+)
+@click.option(
+    "--batch-personas/--no-batch-personas",
+    default=False,
+    help=(
+        "Ask for the performance, maintainability and security reviews in "
+        "one LLM call so the diff is sent once instead of three times. "
+        "Cheaper on prompt tokens, but the persona phase takes longer."
+    ),
+)
 @click.pass_context
 def review(
     ctx: click.Context,
     staged: bool,
     output: str,
     output_path: str,
+    no_cache: bool,
+    self_critique: bool,
+    batch_personas: bool,
 ) -> None:
     """Run the repository review pipeline and print or write the result.
 
@@ -45,6 +71,10 @@ def review(
         staged: If True review staged changes (default); otherwise review uncommitted changes.
         output: Output format: "markdown" or "json".
         output_path: Optional file path to write output; if not provided output is printed to stdout.
+        no_cache: Skip cached LLM replies; fresh replies still replace the
+            cached entries.
+        self_critique: Run the self-consistency pass on the synthesized report.
+        batch_personas: Request all persona reviews in a single LLM call.
     """
     mode = "staged" if staged else "uncommitted"
     logger.info(f"Running review command in mode: {mode}")
@@ -61,7 +91,13 @@ def review(
     click.echo(
         "🚦 Starting review pipeline (this may take a while)..."
     )
-    result = run_review_pipeline(diff=diff, model=model)
+    result = run_review_pipeline(
+        diff=diff,
+        model=model,
+        use_cache=not no_cache,
+        self_critique=self_critique,
+        batch_personas=batch_personas,
+    )
 
     # Prepare formatted output
     out_format = output or "markdown"
@@ -0,0 +1,100 @@
+import logging
+from typing import Optional
+from ai_toolbox import llm_cache
+from ai_toolbox.llm_utils import count_tokens, max_input_tokens
+
+logger = logging.getLogger(__name__)
+
+# Most tokens of diff a single review request may carry; lowered to half
+# the model's context window for models with small windows. Larger diffs
+# keep their head and tail and elide the middle.
+REVIEW_DIFF_TOKEN_BUDGET = 30_000
+
+# llm_cache namespace for how many head and tail lines of an oversized
+# diff fit the token budget, keyed by model and diff, so a re-run over the
+# same diff neither imports litellm nor tokenizes it again; entries expire
+# after 30 minutes, like cached review replies
+REVIEW_BUDGET_CACHE_NAMESPACE = "review_budget"
+REVIEW_BUDGET_CACHE_TTL = 30 * 60
+
+
+def diff_token_budget(model: str) -> int:
+    """Return how many tokens of diff one review request may carry."""
+    window = max_input_tokens(model)
+    if window:
+        return min(window // 2, REVIEW_DIFF_TOKEN_BUDGET)
+    return REVIEW_DIFF_TOKEN_BUDGET
+
+
+def _lines_to_keep(diff: str, model: str, budget_tokens: int) -> Optional[int]:
+    """Return how many head and tail lines of ``diff`` fit the budget.
+
+    Returns None when the whole diff fits. Otherwise the count is found by
+    binary search over the token count of the elided diff. Diffs with no
+    more characters than the budget skip tokenization, since a token
+    never spans less than one character.
+    """
+    if len(diff) <= budget_tokens or count_tokens(model, diff) <= budget_tokens:
+        return None
+
+    lines = diff.split("\n")
+    low, high = 0, (len(lines) - 1) // 2
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(model, _elide_diff(diff, mid)) <= budget_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    logger.warning(
+        f"Diff exceeds the {budget_tokens} token budget; "
+        f"eliding {len(lines) - 2 * low} of {len(lines)} lines"
+    )
+    return low
+
+
+def _elide_diff(diff: str, keep: Optional[int]) -> str:
+    """Keep the first and last ``keep`` lines around an omission marker.
+
+    ``keep=None`` returns ``diff`` unchanged.
+    """
+    if keep is None:
+        return diff
+    lines = diff.split("\n")
+    omitted = len(lines) - 2 * keep
+    marker = f"... <{omitted} lines omitted> ..."
+    return "\n".join(lines[:keep] + [marker] + lines[len(lines) - keep :])
+
+
+def fit_diff_to_budget(diff: str, model: str, budget_tokens: int) -> str:
+    """Return ``diff`` shortened to at most ``budget_tokens`` tokens.
+
+    Keeps the same number of lines from the head and the tail of the diff
+    and replaces the middle with a marker saying how many lines were
+    omitted. Diffs within budget are returned unchanged.
+    """
+    return _elide_diff(diff, _lines_to_keep(diff, model, budget_tokens))
+
+
+def budgeted_diff(diff: str, model: str, use_cache: bool = True) -> str:
+    """Return ``diff`` fitted to ``model``'s token budget, memoised on disk.
+
+    Only the number of kept lines is stored, under
+    ``REVIEW_BUDGET_CACHE_NAMESPACE``, so a re-run over the same diff skips
+    the context-window lookup and tokenization that would otherwise run
+    before the phases can even check the reply cache.
+    """
+    cache_key = llm_cache.make_key(
+        model, str(REVIEW_DIFF_TOKEN_BUDGET), diff
+    )
+    if use_cache:
+        cached = llm_cache.load(
+            REVIEW_BUDGET_CACHE_NAMESPACE,
+            cache_key,
+            max_age=REVIEW_BUDGET_CACHE_TTL,
+        )
+        if isinstance(cached, dict) and "keep" in cached:
+            return _elide_diff(diff, cached["keep"])
+
+    keep = _lines_to_keep(diff, model, diff_token_budget(model))
+    llm_cache.store(REVIEW_BUDGET_CACHE_NAMESPACE, cache_key, {"keep": keep})
+    return _elide_diff(diff, keep)
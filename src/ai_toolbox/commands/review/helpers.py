@@ -1,16 +1,38 @@
 import click
 import logging
-import json
-from typing import Optional, Any, Union
-from litellm import completion
+import operator
+import os
+import random
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional, Union
+from ai_toolbox import diff_utils, json_utils, llm_cache
+from ai_toolbox.llm_utils import (
+    cacheable_message,
+    completion,
+    is_authentication_error,
+    is_transient_error,
+)
+from ai_toolbox.llm_requests import (
+    InflightStream,
+    inflight_slot,
+    is_json,
+    request_cache_key,
+    stream_to_stderr,
+)
 from ai_toolbox.tool_utils import TOOL_REGISTRY
-from litellm.exceptions import AuthenticationError
 from .interfaces import (
     ReviewResult,
-    ReviewIssue,
     review_result_factory,
 )
+from .diff_budget import budgeted_diff
+from .parsing import is_placeholder, parse_persona_batch, parse_review_response
+from .tool_calls import run_tool_turn
 from .prompts import (
+    BATCHED_PERSONA_REVIEW_TEMPLATE,
     SYNTAX_REVIEW_TEMPLATE,
     LOGIC_REVIEW_TEMPLATE,
     PERFORMANCE_REVIEW_TEMPLATE,
@@ -22,94 +44,189 @@ from .prompts import (
 
 logger = logging.getLogger(__name__)
 
+# Per-request LLM timeout in seconds. Review phases run concurrently, so a
+# stalled endpoint should fail its own phase rather than hang the pipeline.
+LLM_REQUEST_TIMEOUT = 120
+
+# Transient LLM errors (rate limits, connection drops, timeouts, 5xx) are
+# retried this many times with exponential backoff plus jitter
+LLM_MAX_RETRIES = 3
+LLM_RETRY_BASE_DELAY = 0.5
+
+# Diffs longer than this are reviewed in chunks of whole files so every
+# request stays well inside the model's context window
+REVIEW_CHUNK_CHARS = 40_000
+
+# Upper bound on concurrent LLM requests across all review phases
+MAX_LLM_WORKERS = 8
+
+# Persona name -> system prompt of the persona review phase
+REVIEW_PERSONAS = {
+    "performance": PERFORMANCE_REVIEW_TEMPLATE,
+    "maintainability": MAINTAINABILITY_REVIEW_TEMPLATE,
+    "security": SECURITY_REVIEW_TEMPLATE,
+}
+
+# Output token cap per phase. Analysis and persona replies only feed later
+# LLM calls, so they get tighter limits than the reports users read. Each
+# value can be overridden with AI_TOOLBOX_REVIEW_MAX_TOKENS_<PHASE>, e.g.
+# AI_TOOLBOX_REVIEW_MAX_TOKENS_ANALYZE=2000.
+REVIEW_MAX_TOKENS = {
+    "analyze": 800,
+    "persona": 1500,
+    "synthesis": 3000,
+    "self_consistency": 3000,
+}
+
+# llm_cache namespace for final review replies, keyed by model, request
+# messages and tool schemas; entries expire after 30 minutes
+REVIEW_CACHE_NAMESPACE = "review"
+REVIEW_CACHE_TTL = 30 * 60
+
+
+
+@lru_cache(maxsize=None)
+def _llm_executor() -> ThreadPoolExecutor:
+    """Return the thread pool shared by all concurrent review phases.
+
+    Created on first use and reused for the rest of the process, so later
+    phases (and later pipeline runs in the same process) don't spin up new
+    threads. Only submit leaf LLM calls: a task that waits on other tasks
+    of this pool could deadlock it once all workers are busy.
+    """
+    return ThreadPoolExecutor(
+        max_workers=MAX_LLM_WORKERS, thread_name_prefix="ai-toolbox-llm"
+    )
 
-def _parse_review_response(
-    response_content: str, review_name: str = "unknown"
-) -> ReviewResult:
-    """Parse a JSON-formatted review response into a ReviewResult.
 
-    The helper expects ``response_content`` to be a JSON string with keys
-    like ``summary``, ``issues`` and ``suggestions``. On a JSON parsing
-    error it returns a ``ReviewResult`` containing a single parsing issue.
+def _completion_with_retry(review_name: str, **kwargs: Any) -> Any:
+    """Call ``completion``, retrying transient errors with backoff.
 
-    Args:
-        response_content: JSON string returned by an LLM assistant.
-        review_name: Optional name used for logging/context.
+    Each attempt holds one of the process-wide in-flight slots while the
+    request runs. With ``stream=True`` the returned stream keeps the slot
+    until it is exhausted or closed. Waits
+    ``LLM_RETRY_BASE_DELAY * 2**attempt`` seconds plus up to 0.25s of
+    jitter between attempts, without holding a slot. Other errors, and a
+    transient error that persists after ``LLM_MAX_RETRIES`` retries, are
+    raised to the caller.
 
-    Returns:
-        A ``ReviewResult`` representing the parsed content or an error result
-        if parsing failed.
+    Only errors raised by the ``completion`` call itself are retried. An
+    error raised while a stream is being read reaches the caller as is:
+    part of the reply has already been echoed, so it cannot be replayed.
     """
-    try:
-        data = json.loads(response_content)
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            with ExitStack() as slot:
+                slot.enter_context(inflight_slot(review_name))
+                response = completion(**kwargs)
+                if kwargs.get("stream"):
+                    return InflightStream(response, slot.pop_all().close)
+                return response
+        except Exception as e:
+            if attempt == LLM_MAX_RETRIES or not is_transient_error(e):
+                raise
+            delay = LLM_RETRY_BASE_DELAY * 2**attempt + random.uniform(
+                0, 0.25
+            )
+            logger.warning(
+                f"Transient LLM error in {review_name} "
+                f"(attempt {attempt + 1}/{LLM_MAX_RETRIES + 1}), "
+                f"retrying in {delay:.1f}s: {e}"
+            )
+            time.sleep(delay)
 
-        issues = []
 
-        for issue_data in data.get("issues", []):
-            issue = ReviewIssue(
-                id=issue_data.get("id", ""),
-                severity=issue_data.get("severity", "info"),
-                category=issue_data.get("category", ""),
-                description=issue_data.get("description", ""),
-                file=issue_data.get("file"),
-                line=issue_data.get("line"),
-                snippet=issue_data.get("snippet"),
+def _max_tokens(phase: str) -> int:
+    """Return the output token cap for ``phase`` (a ``REVIEW_MAX_TOKENS`` key).
+
+    Invalid environment overrides are logged and ignored.
+    """
+    env_var = f"AI_TOOLBOX_REVIEW_MAX_TOKENS_{phase.upper()}"
+    override = os.environ.get(env_var)
+    if override:
+        try:
+            return int(override)
+        except ValueError:
+            logger.warning(
+                f"Ignoring non-integer {env_var}={override!r}"
             )
-            issues.append(issue)
+    return REVIEW_MAX_TOKENS[phase]
 
-        result = ReviewResult(
-            summary=data.get("summary", ""),
-            issues=issues,
-            suggestions=data.get("suggestions", []),
-        )
 
-        return result
-    except json.JSONDecodeError as e:
-        logger.error(
-            f"Failed to parse JSON for {review_name}: {e}"
-        )
-        return ReviewResult(
-            summary=f"Failed to parse JSON for {review_name}: {e}",
-            issues=[
-                ReviewIssue(
-                    id="",
-                    severity="major",
-                    category="parsing",
-                    description=f"Failed to parse JSON: {e}",
-                    file=None,
-                    line=None,
-                    snippet=None,
-                )
-            ],
-            suggestions=[],
-        )
-    except Exception as e:
-        logger.exception(
-            f"Unexpected error parsing review response for {review_name}: {e}"
-        )
-        return ReviewResult(
-            summary=f"Unexpected error parsing review response for {review_name}: {e}",
-            issues=[
-                ReviewIssue(
-                    id="",
-                    severity="major",
-                    category="parsing",
-                    description=f"Unexpected error: {e}",
-                    file=None,
-                    line=None,
-                    snippet=None,
-                )
-            ],
-            suggestions=[],
+@dataclass(frozen=True, slots=True)
+class _CallOptions:
+    """Per-phase settings of a review LLM call.
+
+    Attributes:
+        tool_schemas: Optional list of tool schemas exposed to the model.
+        max_tool_iterations: Maximum cycles of tool-calling allowed.
+        use_cache: If False skip the cache lookup; the fresh reply still
+            replaces the cached entry.
+        stream: If True echo the reply to stderr while it is generated.
+            Only for phases without tools: a streamed reply is final.
+        max_tokens: Optional cap on the tokens generated per model reply.
+    """
+
+    tool_schemas: list[dict] | None = None
+    max_tool_iterations: int = 5
+    use_cache: bool = True
+    stream: bool = False
+    max_tokens: int | None = None
+
+
+# Every review reply is a JSON object
+_RESPONSE_FORMAT = {"type": "json_object"}
+
+
+def _cached_reply(cache_key: str, review_name: str) -> Optional[str]:
+    """Return the cached final reply stored under ``cache_key``, if any."""
+    cached = llm_cache.load(
+        REVIEW_CACHE_NAMESPACE, cache_key, max_age=REVIEW_CACHE_TTL
+    )
+    if isinstance(cached, dict) and isinstance(cached.get("content"), str):
+        logger.info(f"Reusing cached {review_name} review")
+        return cached["content"]
+    return None
+
+
+def _request_reply(
+    messages: list[dict], model: str, review_name: str, options: _CallOptions
+) -> tuple[str, Any]:
+    """Send one request and return ``(reply text, tool-calling message)``.
+
+    The message is None when the reply is final: it requested no tools,
+    or it was streamed.
+    """
+    model_response: Any = _completion_with_retry(
+        review_name,
+        model=model,
+        messages=messages,
+        tools=options.tool_schemas,
+        response_format=_RESPONSE_FORMAT,
+        timeout=LLM_REQUEST_TIMEOUT,
+        stream=options.stream,
+        max_tokens=options.max_tokens,
+    )
+    if options.stream:
+        return stream_to_stderr(model_response), None
+
+    choice = model_response.choices[0]
+    if getattr(choice, "finish_reason", None) == "length":
+        logger.warning(
+            f"{review_name} reply hit the {options.max_tokens} token limit"
         )
+    model_message = choice.message
+    # No tool calls means the model answer is final
+    tool_message = model_message if model_message.tool_calls else None
+    return model_message.content or "", tool_message
 
 
 def _execute_llm_call(
     messages: list[dict],
     model: str,
     review_name: str,
-    max_tool_iterations: int = 5,
-    tool_schemas: list[dict] | None = None,
+    options: _CallOptions = _CallOptions(),
+    parse: Callable[[str, str], Any] = parse_review_response,
 ):
     """Execute an LLM-driven review loop supporting tool calls.
 
@@ -117,103 +234,131 @@ def _execute_llm_call(
     multi-turn tool invocation: when the model returns ``tool_calls`` the
     helper executes the requested tools via ``TOOL_REGISTRY`` and appends
     the results back into the conversation. The process repeats until the
-    model returns no tool calls or the ``max_tool_iterations`` limit is
-    reached.
+    model returns no tool calls or the ``max_tool_iterations`` limit of
+    ``options`` is reached. Tool calls requested in the same turn run
+    concurrently, and results of cacheable tools are reused when the model
+    repeats a call with the same arguments during the review.
+
+    Final replies that parse as JSON are stored in ``llm_cache`` under a
+    key derived from the initial request, so running the same review again
+    returns the stored reply without calling the model.
 
     Args:
         messages: Conversation messages (system/user history) to send to the model.
         model: LLM model id to use.
         review_name: Logical name for logging and error messages.
-        max_tool_iterations: Maximum cycles of tool-calling allowed.
-        tool_schemas: Optional list of tool schemas exposed to the model.
+        options: Tools, caching, streaming and token cap of the call.
+        parse: Turns the final reply text and ``review_name`` into the
+            result; cached replies go through it as well.
 
     Returns:
-        A ``ReviewResult`` built by parsing the model's final assistant message.
+        The parsed final assistant message (a ``ReviewResult`` by default),
+        or a ``ReviewResult`` describing the error if the call failed.
     """
-    iteration = 0
-    last_message = ""
+    # Key on the request as given; tool turns appended below are part of
+    # producing the reply, not of the request.
+    cache_key = request_cache_key(
+        model,
+        messages,
+        options.tool_schemas,
+        options.max_tokens,
+        _RESPONSE_FORMAT,
+    )
+    if options.use_cache:
+        cached = _cached_reply(cache_key, review_name)
+        if cached is not None:
+            return parse(cached, review_name)
 
+    last_message = ""
+    tool_message = None
+    # (tool name, canonical JSON args) -> result, for this review only
+    tool_cache: dict[tuple[str, str], str] = {}
     try:
-        while iteration < max_tool_iterations:
-            iteration += 1
-
-            model_response: Any = completion(
-                model=model,
-                messages=messages,
-                tools=tool_schemas,
-                response_format={"type": "json_object"},
+        for _ in range(options.max_tool_iterations):
+            last_message, tool_message = _request_reply(
+                messages, model, review_name, options
             )
-
-            model_message = model_response.choices[0].message
-            last_message = model_message.content or ""
-
-            # If there are no tool_calls, it means that the
-            # model answer is final and we can exit the loop
-            if not model_message.tool_calls:
+            if not tool_message:
                 break
+            messages.extend(run_tool_turn(tool_message, tool_cache))
 
-            messages.append(model_message)
-            tool_calls = model_message.tool_calls
-
-            for tool_call in tool_calls:
-                tool_id = tool_call.id
-                tool_name = tool_call.function.name
-                raw_tool_args = tool_call.function.arguments
-
-                try:
-                    args = (
-                        json.loads(raw_tool_args)
-                        if raw_tool_args
-                        else {}
-                    )
-                except json.JSONDecodeError:
-                    args = {}
-
-                try:
-                    tool_result = TOOL_REGISTRY.call_tool(
-                        tool_name, **args
-                    )
-                except KeyError:
-                    tool_result = (
-                        f"<error: tool not found: {tool_name}>"
-                    )
-                except Exception as e:
-                    tool_result = (
-                        f"<error: tool execution failed: {e}>"
-                    )
-
-                # Append the tool result to messages so the LLM can consume it
-                messages.append(
-                    {
-                        "role": "tool",
-                        "name": tool_name,
-                        "content": str(tool_result),
-                        "tool_call_id": tool_id,
-                    }
-                )
-
-        return _parse_review_response(last_message, review_name)
-    except AuthenticationError as e:
-        logger.error(f"LLM authentication failed in: {e}")
-        return review_result_factory(
-            "auth-error", error_message=str(e)
-        )
+        if not tool_message and is_json(last_message):
+            llm_cache.store(
+                REVIEW_CACHE_NAMESPACE,
+                cache_key,
+                {"content": last_message},
+            )
+        return parse(last_message, review_name)
     except Exception as e:
+        if is_authentication_error(e):
+            logger.error(f"LLM authentication failed in: {e}")
+            return review_result_factory(
+                "auth-error", error_message=str(e)
+            )
         logger.exception(f"Unexpected error calling LLM: {e}")
         return review_result_factory(
             "generic-error", error_message=str(e)
         )
 
 
+def _run_review(
+    template: str,
+    user_content: str,
+    model: Optional[str],
+    review_name: str,
+    options: _CallOptions = _CallOptions(),
+) -> ReviewResult:
+    """Run one review phase: ``template`` as system prompt, ``user_content`` as input.
+
+    Shared by every phase so message layout, prompt caching hints and the
+    no-model short-circuit live in one place.
+
+    Args:
+        template: Static system prompt of the phase.
+        user_content: Per-request input (diff, reviews or draft report).
+        model: Optional LLM model id; if None a ``no-model`` placeholder is returned.
+        review_name: Logical name for logging and error messages.
+        options: Tools, caching, streaming and token cap of the call.
+
+    Returns:
+        A ``ReviewResult`` produced by the LLM or a placeholder when no model is provided.
+    """
+    if not model:
+        logger.debug(
+            f"No model provided for {review_name} review - skipping LLM call"
+        )
+        return review_result_factory("no-model")
+
+    messages = [
+        cacheable_message("system", template, model),
+        {"role": "user", "content": user_content},
+    ]
+    return _execute_llm_call(messages, model, review_name, options)
+
+
+def _diff_block(diff: str) -> str:
+    """Return ``diff`` wrapped in ``<diff>`` tags for a review user message.
+
+    The analysis and persona phases all send the same diff; callers that
+    run several of them build the block once and pass it down, so the
+    phases share one copy instead of each formatting a new string the
+    size of the diff.
+    """
+    return f"<diff>\n{diff}\n</diff>"
+
+
 def _print_review_overview(review: ReviewResult) -> None:
     """Print a short overview of a ReviewResult to the console.
 
     The helper prints a compact summary line containing the review summary,
     the number of issues found and the number of suggestions.
     """
-    click.echo(f"Summary: {review.summary}")
-    click.echo(f"Issues found: {len(review.issues)}")
-    click.echo(f"Suggestions: {len(review.suggestions)}")
+    # One echo (one write and flush) for the whole block
+    click.echo(
+        f"Summary: {review.summary}\n"
+        f"Issues found: {len(review.issues)}\n"
+        f"Suggestions: {len(review.suggestions)}"
+    )
 
 
 def run_persona_review(
@@ -221,6 +366,8 @@ def run_persona_review(
     persona_template: str,
     persona_name: str,
     model: Optional[str] = None,
+    use_cache: bool = True,
+    diff_block: Optional[str] = None,
 ) -> ReviewResult:
     """Run a single persona-driven review.
 
@@ -234,6 +381,10 @@ def run_persona_review(
         persona_template: System prompt describing the persona and expectations.
         persona_name: Name used for logging and result identification.
         model: Optional LLM model id; if None the call is skipped.
+        use_cache: If False skip cached replies and always call the model.
+        diff_block: ``diff`` already wrapped by ``_diff_block``, so
+            phases run over the same diff share one copy; built from
+            ``diff`` when None.
 
     Returns:
         A ``ReviewResult`` produced by the LLM or a placeholder when no model is provided.
@@ -241,30 +392,23 @@ def run_persona_review(
     logger.debug(
         f"run_persona_review called for persona {persona_name}"
     )
-    messages = [
-        {
-            "role": "system",
-            "content": persona_template,
-        },
-        {
-            "role": "user",
-            "content": f"<diff>\n{diff}\n</diff>",
-        },
-    ]
-
-    if not model:
-        logger.debug(
-            "No model provided for persona review - skipping LLM call"
-        )
-        return review_result_factory("no-model")
-
-    return _execute_llm_call(messages, model, persona_name)
+    return _run_review(
+        persona_template,
+        _diff_block(diff) if diff_block is None else diff_block,
+        model,
+        persona_name,
+        _CallOptions(
+            use_cache=use_cache,
+            max_tokens=_max_tokens("persona"),
+        ),
+    )
 
 
 def run_reviews_with_personas(
     diff: str,
     personas_dict: dict[str, str],
     model: Optional[str] = None,
+    use_cache: bool = True,
 ) -> dict[str, ReviewResult]:
     """Run multiple persona reviews and return a mapping of persona->ReviewResult.
 
@@ -272,91 +416,398 @@ def run_reviews_with_personas(
         diff: The unified diff text to be reviewed.
         personas_dict: Mapping of persona name to persona template string.
         model: Optional model id; if None persona calls are skipped and placeholders are returned.
+        use_cache: If False skip cached replies and always call the model.
 
     Returns:
-        A dict mapping each persona name to its ``ReviewResult``.
+        A dict mapping each persona name to its ``ReviewResult``, in the
+        order of ``personas_dict``.
     """
-    reviews: dict[str, ReviewResult] = {}
-    for persona_name, persona_template in personas_dict.items():
-        click.echo(
-            f"👥 Running persona {persona_name} review..."
-        )
-        reviews[persona_name] = run_persona_review(
+    if not personas_dict:
+        return {}
+
+    # Persona reviews are independent LLM calls; run them concurrently so
+    # the phase takes as long as the slowest persona instead of the sum.
+    executor = _llm_executor()
+    diff_block = _diff_block(diff)
+    futures = {
+        persona_name: executor.submit(
+            run_persona_review,
             diff,
             persona_template,
             persona_name=persona_name,
             model=model,
+            use_cache=use_cache,
+            diff_block=diff_block,
         )
-    return reviews
+        for persona_name, persona_template in personas_dict.items()
+    }
+    # Report progress only once every request is in flight so a slow
+    # terminal never delays submitting the next one.
+    for persona_name in futures:
+        click.echo(
+            f"👥 Running persona {persona_name} review..."
+        )
+    return {
+        persona_name: future.result()
+        for persona_name, future in futures.items()
+    }
+
+
+@lru_cache(maxsize=8)
+def _batched_persona_template(personas: tuple[tuple[str, str], ...]) -> str:
+    """Return the system prompt asking for every persona in one reply."""
+    return BATCHED_PERSONA_REVIEW_TEMPLATE.format(
+        names=", ".join(f'"{name}"' for name, _ in personas),
+        personas="\n".join(
+            f'<persona name="{name}">\n{template}\n</persona>'
+            for name, template in personas
+        ),
+    )
+
+
+def run_batched_persona_review(
+    diff: str,
+    personas_dict: dict[str, str],
+    model: Optional[str] = None,
+    use_cache: bool = True,
+    diff_block: Optional[str] = None,
+) -> dict[str, ReviewResult]:
+    """Run several persona reviews as a single LLM request.
+
+    The persona templates are combined into one system prompt and the diff
+    is sent once, so its prompt tokens are paid once instead of once per
+    persona. The trade-off is latency: the reviews are generated one after
+    another in a single reply rather than in parallel requests.
+
+    Args:
+        diff: The unified diff text to be reviewed.
+        personas_dict: Mapping of persona name to persona template string.
+        model: Optional model id; if None placeholders are returned.
+        use_cache: If False skip cached replies and always call the model.
+        diff_block: ``diff`` already wrapped by ``_diff_block``, so
+            phases run over the same diff share one copy; built from
+            ``diff`` when None.
+
+    Returns:
+        A dict mapping each persona name to its ``ReviewResult``, in the
+        order of ``personas_dict``. If the request fails every persona
+        gets the same error result.
+    """
+    if not personas_dict:
+        return {}
+    if not model:
+        logger.debug(
+            "No model provided for batched persona review - skipping LLM call"
+        )
+        return {
+            name: review_result_factory("no-model") for name in personas_dict
+        }
+
+    personas = tuple(personas_dict.items())
+    messages = [
+        cacheable_message(
+            "system", _batched_persona_template(personas), model
+        ),
+        {
+            "role": "user",
+            "content": _diff_block(diff) if diff_block is None else diff_block,
+        },
+    ]
+    result = _execute_llm_call(
+        messages,
+        model,
+        "batched persona",
+        _CallOptions(
+            use_cache=use_cache,
+            max_tokens=_max_tokens("persona") * len(personas),
+        ),
+        parse=partial(parse_persona_batch, tuple(personas_dict)),
+    )
+    if isinstance(result, ReviewResult):
+        # The request itself failed
+        return {name: result for name in personas_dict}
+    return result
 
 
 def synthesize_perspectives(
     reviews: dict[str, ReviewResult],
     model: Optional[str] = None,
+    use_cache: bool = True,
+    stream: bool = False,
 ) -> ReviewResult:
     """Synthesize several persona review results into a single consolidated report.
 
     This constructs a combined text payload from the provided ``reviews`` and
     asks the model (via ``SYNTHESIS_TEMPLATE``) to produce a consolidated
-    review. If ``model`` is None a ``no-model`` placeholder result is returned.
+    review. Issues with the same file, line and description as one from an
+    earlier review are sent only once. If every review is a placeholder or
+    an error result there is nothing to merge: the first of them is
+    returned without calling the model. If ``model`` is None a ``no-model`` placeholder result is returned.
 
     Args:
         reviews: Mapping of persona name to ``ReviewResult``.
         model: Optional model id used to drive the synthesis.
+        use_cache: If False skip cached replies and always call the model.
+        stream: If True echo the report to stderr while it is generated.
 
     Returns:
         A ``ReviewResult`` representing the synthesized report or a placeholder when no model is provided.
     """
     logger.debug("synthesize_perspectives called")
+    if reviews and all(map(is_placeholder, reviews.values())):
+        # Nothing to merge; pass the first placeholder or error through
+        logger.info("No review findings to synthesize - skipping LLM call")
+        return next(iter(reviews.values()))
+
+    # All reviews go out as one compact JSON object keyed by phase, built
+    # with a single serializer call. An issue already reported by an
+    # earlier phase for the same file, line and description is left out so
+    # synthesis doesn't spend tokens merging it again.
+    payload = {}
+    seen: set[tuple] = set()
+    duplicates = 0
+    for persona, review in reviews.items():
+        data = review.to_dict()
+        issues = []
+        for issue in data["issues"]:
+            description = (issue["description"] or "").strip()
+            key = (issue["file"], issue["line"], description)
+            if key in seen:
+                duplicates += 1
+            else:
+                seen.add(key)
+                issues.append(issue)
+        data["issues"] = issues
+        payload[persona.upper()] = data
+    combined_text = json_utils.dumps(payload)
+    if duplicates:
+        combined_text += (
+            f"\n({duplicates} duplicate issue(s) already listed by an "
+            "earlier review were omitted)"
+        )
 
-    if not model:
-        logger.debug(
-            "No model provided for synthesis - skipping LLM call"
+    return _run_review(
+        SYNTHESIS_TEMPLATE,
+        f"<reviews>\n{combined_text}\n</reviews>",
+        model,
+        "synthesis",
+        _CallOptions(
+            use_cache=use_cache,
+            stream=stream,
+            max_tokens=_max_tokens("synthesis"),
+        ),
+    )
+
+
+def _map_future(future: Future, fn: Callable[[Any], Any]) -> Future:
+    """Return a future resolved with ``fn`` applied to ``future``'s result."""
+    mapped: Future = Future()
+
+    def resolve(done: Future) -> None:
+        try:
+            mapped.set_result(fn(done.result()))
+        except BaseException as e:
+            mapped.set_exception(e)
+
+    future.add_done_callback(resolve)
+    return mapped
+
+
+def _submit_review_phases(
+    diff: str,
+    model: Optional[str],
+    use_cache: bool,
+    batch_personas: bool = False,
+) -> dict[str, Future]:
+    """Submit the analysis and persona phases for ``diff`` to the shared pool.
+
+    The five phases are independent LLM conversations over the same diff,
+    so they all run at once and take as long as the slowest of them. With
+    ``batch_personas`` the persona reviews share one request instead
+    (see ``run_batched_persona_review``); each persona still gets its own
+    future.
+
+    Returns:
+        A dict mapping phase name (``syntax``, ``logic``, persona names) to
+        the future of its ``ReviewResult``.
+    """
+    executor = _llm_executor()
+    # Wrapped once here and shared by every phase of this diff
+    block = _diff_block(diff)
+    futures = {
+        "syntax": executor.submit(
+            analyze_syntax,
+            diff,
+            model=model,
+            use_cache=use_cache,
+            diff_block=block,
+        ),
+        "logic": executor.submit(
+            analyze_logic,
+            diff,
+            model=model,
+            use_cache=use_cache,
+            diff_block=block,
+        ),
+    }
+    if batch_personas:
+        batch = executor.submit(
+            run_batched_persona_review,
+            diff,
+            REVIEW_PERSONAS,
+            model=model,
+            use_cache=use_cache,
+            diff_block=block,
         )
-        return review_result_factory("no-model")
+        for persona_name in REVIEW_PERSONAS:
+            futures[persona_name] = _map_future(
+                batch, operator.itemgetter(persona_name)
+            )
+        return futures
+    for persona_name, persona_template in REVIEW_PERSONAS.items():
+        futures[persona_name] = executor.submit(
+            run_persona_review,
+            diff,
+            persona_template,
+            persona_name=persona_name,
+            model=model,
+            use_cache=use_cache,
+            diff_block=block,
+        )
+    return futures
 
-    combined = []
 
-    for persona, review in reviews.items():
-        combined.append(f"\n{persona.upper()} REVIEW:")
-        combined.append(json.dumps(review.to_dict()))
+def _collect_phase_results(
+    futures: dict[str, Future],
+) -> dict[str, ReviewResult]:
+    """Wait for submitted phases, reporting each one as it finishes.
 
-    combined_text = "\n".join(combined)
+    Returns:
+        The results keyed like ``futures`` and in the same order, whatever
+        order the phases finished in.
+    """
+    names = {future: name for name, future in futures.items()}
+    for future in as_completed(names):
+        click.echo(f"  ✓ {names[future]} finished")
+    return {name: future.result() for name, future in futures.items()}
 
-    messages = [
-        {
-            "role": "system",
-            "content": SYNTHESIS_TEMPLATE,
-        },
-        {
-            "role": "user",
-            "content": f"<reviews>\n{combined_text}\n</reviews>",
-        },
-    ]
 
-    return _execute_llm_call(messages, model, "synthesis")
+def _review_diff(
+    diff: str, model: Optional[str], use_cache: bool, batch_personas: bool
+) -> dict[str, ReviewResult]:
+    """Run the analysis and persona phases over a diff that fits one request.
+
+    Returns:
+        A dict mapping phase name (persona, ``syntax``, ``logic``) to its result.
+    """
+    # Submit first: the progress lines are printed while the requests run
+    # instead of holding them back.
+    futures = _submit_review_phases(diff, model, use_cache, batch_personas)
+    click.echo(
+        "🔧 Starting syntax analysis...\n"
+        "🧠 Starting logic analysis...\n"
+        "👥 Running persona-based reviews (performance, maintainability, security)..."
+    )
+    persona_reviews = _collect_phase_results(futures)
+    syntax_result = persona_reviews.pop("syntax")
+    logic_result = persona_reviews.pop("logic")
+
+    click.echo("✅ Syntax analysis completed\n")
+    _print_review_overview(syntax_result)
+    click.echo("\n-----\n")
+
+    click.echo("✅ Logic analysis completed\n")
+    _print_review_overview(logic_result)
+    click.echo("\n-----\n")
+
+    click.echo("✅ Persona reviews completed")
+    for persona, review in persona_reviews.items():
+        click.echo(
+            f"--- {persona.capitalize()} Review ---\n"
+        )
+        _print_review_overview(review)
+        click.echo("\n-----\n")
+
+    return {
+        **persona_reviews,
+        "syntax": syntax_result,
+        "logic": logic_result,
+    }
+
+
+def _review_chunks(
+    chunks: list[str],
+    model: Optional[str],
+    use_cache: bool,
+    batch_personas: bool,
+) -> dict[str, ReviewResult]:
+    """Run the analysis and persona phases over each chunk of a large diff.
+
+    Every (chunk, phase) pair is an independent LLM request submitted to
+    the shared executor, so at most ``MAX_LLM_WORKERS`` run at once. Results are keyed as
+    ``"<phase> (part i/n)"`` so synthesis can tell the chunks apart.
+
+    Returns:
+        A dict mapping labelled phase name to its result, in chunk order.
+    """
+    total = len(chunks)
+    futures = {}
+    for index, chunk in enumerate(chunks, start=1):
+        part = f"(part {index}/{total})"
+        for phase, future in _submit_review_phases(
+            chunk, model, use_cache, batch_personas
+        ).items():
+            futures[f"{phase} {part}"] = future
+    click.echo(
+        f"📦 Large diff: reviewing it in {total} chunks of whole files..."
+    )
+    reviews = _collect_phase_results(futures)
+
+    click.echo("✅ Chunked analysis and persona reviews completed")
+    for name, review in reviews.items():
+        click.echo(f"--- {name.capitalize()} Review ---\n")
+        _print_review_overview(review)
+        click.echo("\n-----\n")
+    return reviews
 
 
 def run_review_pipeline(
-    diff: Optional[str] = None, model: Optional[str] = None
+    diff: Optional[str] = None,
+    model: Optional[str] = None,
+    use_cache: bool = True,
+    self_critique: bool = False,
+    batch_personas: bool = False,
 ) -> ReviewResult:
     """High-level review pipeline coordinating analysis phases.
 
-    The pipeline runs syntax analysis, logic analysis, persona-driven reviews
-    (performance, maintainability, security), synthesis and a self-consistency
-    pass. Each phase produces a ``ReviewResult`` and intermediate overviews
-    are printed to the console. The final, refined ``ReviewResult`` is returned.
+    The pipeline runs syntax and logic analysis (concurrently), persona-driven
+    reviews (performance, maintainability, security), synthesis and, if
+    requested, a self-consistency pass. Each phase produces a ``ReviewResult`` and intermediate overviews
+    are printed to the console. The final ``ReviewResult`` is returned.
+
+    Diffs longer than ``REVIEW_CHUNK_CHARS`` are split into chunks of whole
+    files; the analysis and persona phases run per chunk and synthesis
+    combines all of their results.
 
     Args:
-        diff: Unified diff text to analyze. If None an immediate ``no-model``-style
-              result with summary 'No diff provided - skipping review' is returned.
+        diff: Unified diff text to analyze. If None, empty or whitespace-only an
+              immediate ``no-model``-style result with summary
+              'No diff provided - skipping review' is returned without any LLM call.
         model: Optional LLM model id. If None LLM phases are skipped and placeholder results are used.
+        use_cache: If False every phase calls the model even when a cached
+            reply exists for the same request.
+        self_critique: If True run ``self_consistency_review`` on the
+            synthesized report; otherwise the synthesis is the final result.
+        batch_personas: If True request all persona reviews of a diff (or
+            chunk) in one LLM call, sending the diff once instead of once
+            per persona, at the cost of a slower persona phase.
 
     Returns:
-        A ``ReviewResult`` representing the final refined review.
+        A ``ReviewResult`` representing the final (refined) review.
     """
     logger.debug("run_review_pipeline called")
-    if not diff:
+    if not diff or diff.isspace():
+        click.echo("⏭ No diff to review - skipping LLM calls")
         return ReviewResult(
             summary="No diff provided - skipping review",
             issues=[],
@@ -366,67 +817,48 @@ def run_review_pipeline(
     # Call analysis helpers if model provided (skipped during tests by default)
     final_review = ""
     try:
-        # Syntax analysis phase
-        click.echo("🔧 Starting syntax analysis...")
-        syntax_result = analyze_syntax(diff, model=model)
-        click.echo("✅ Syntax analysis completed\n")
-        _print_review_overview(syntax_result)
-        click.echo("\n-----\n")
-
-        # Logic analysis phase
-        click.echo("🧠 Starting logic analysis...")
-        logic_result = analyze_logic(diff, model=model)
-        click.echo("✅ Logic analysis completed\n")
-        _print_review_overview(logic_result)
-        click.echo("\n-----\n")
-
-        # Run persona-based reviews
-        click.echo(
-            "👥 Running persona-based reviews (performance, maintainability, security)..."
-        )
-        persona_reviews = run_reviews_with_personas(
-            diff,
-            model=model,
-            personas_dict={
-                "performance": PERFORMANCE_REVIEW_TEMPLATE,
-                "maintainability": MAINTAINABILITY_REVIEW_TEMPLATE,
-                "security": SECURITY_REVIEW_TEMPLATE,
-            },
-        )
-        click.echo("✅ Persona reviews completed")
-        for persona, review in persona_reviews.items():
-            click.echo(
-                f"--- {persona.capitalize()} Review ---\n"
+        chunks = diff_utils.split_diff(diff, REVIEW_CHUNK_CHARS)
+        if model:
+            # A single file can exceed a chunk on its own; keep every
+            # request inside the model's context window.
+            chunks = [
+                budgeted_diff(chunk, model, use_cache) for chunk in chunks
+            ]
+        if len(chunks) == 1:
+            reviews = _review_diff(
+                chunks[0], model, use_cache, batch_personas
+            )
+        else:
+            reviews = _review_chunks(
+                chunks, model, use_cache, batch_personas
             )
-            _print_review_overview(review)
-            click.echo("\n-----\n")
 
         # Synthesize perspectives
         click.echo(
             "🧩 Synthesizing perspectives into a single report..."
         )
         synthesis = synthesize_perspectives(
-            {
-                **persona_reviews,
-                "syntax": syntax_result,
-                "logic": logic_result,
-            },
-            model=model,
+            reviews, model=model, use_cache=use_cache, stream=True
+        )
+        click.echo(
+            "✅ Synthesis completed\n--- Synthesized Report ---\n"
+            f"{synthesis}\n\n-----\n"
         )
-        click.echo("✅ Synthesis completed")
-        click.echo("--- Synthesized Report ---")
-        click.echo(synthesis)
-        click.echo("\n-----\n")
+
+        if not self_critique:
+            return synthesis
 
         # Self-consistency check
         click.echo(
             "🔁 Running self-consistency review on the synthesized report..."
         )
-        refined = self_consistency_review(synthesis, model=model)
-        click.echo("✅ Self-consistency pass completed")
-        click.echo("--- Refined Synthesized Report ---")
-        click.echo(refined)
-        click.echo("\n-----\n")
+        refined = self_consistency_review(
+            synthesis, model=model, use_cache=use_cache, stream=True
+        )
+        click.echo(
+            "✅ Self-consistency pass completed\n"
+            f"--- Refined Synthesized Report ---\n{refined}\n\n-----\n"
+        )
         # Include final polished review in the result
 
         return refined
@@ -441,7 +873,10 @@ def run_review_pipeline(
 
 
 def analyze_syntax(
-    diff: str, model: Optional[str] = None
+    diff: str,
+    model: Optional[str] = None,
+    use_cache: bool = True,
+    diff_block: Optional[str] = None,
 ) -> ReviewResult:
     """Analyze diff for syntax/style issues using an LLM-driven analysis.
 
@@ -452,76 +887,74 @@ def analyze_syntax(
     Args:
         diff: Unified diff to analyze.
         model: Optional LLM model id.
+        use_cache: If False skip cached replies and always call the model.
+        diff_block: ``diff`` already wrapped by ``_diff_block``, so
+            phases run over the same diff share one copy; built from
+            ``diff`` when None.
 
     Returns:
         A ``ReviewResult`` produced by the LLM or a placeholder if no model is provided.
     """
     logger.debug("analyze_syntax called")
 
-    # Prepare messages: put the diff in the user message so the LLM can analyze it
-    messages = [
-        {
-            "role": "system",
-            "content": SYNTAX_REVIEW_TEMPLATE,
-        },
-        {
-            "role": "user",
-            "content": f"<diff>\n{diff}\n</diff>",
-        },
-    ]
-
-    if not model:
-        logger.debug(
-            "No model provided for analyze_syntax - skipping LLM call"
-        )
-        return review_result_factory("no-model")
-
-    return _execute_llm_call(messages, model, "syntax")
+    return _run_review(
+        SYNTAX_REVIEW_TEMPLATE,
+        _diff_block(diff) if diff_block is None else diff_block,
+        model,
+        "syntax",
+        _CallOptions(
+            use_cache=use_cache,
+            max_tokens=_max_tokens("analyze"),
+        ),
+    )
 
 
 def self_consistency_review(
     synthesis: ReviewResult,
     model: Optional[str] = None,
+    use_cache: bool = True,
+    stream: bool = False,
 ) -> ReviewResult:
     """Critique and refine a synthesized report to produce a polished final review.
 
     The function asks the model (using ``SELF_CRITIQUE_TEMPLATE``) to check the
     synthesized report for consistency and polish it. If ``model`` is None a
-    placeholder ``ReviewResult`` is returned.
+    placeholder ``ReviewResult`` is returned; a ``synthesis`` that is itself
+    a placeholder or error result is returned unchanged.
 
     Args:
         synthesis: The synthesized ``ReviewResult`` to critique and refine.
         model: Optional LLM model id.
+        use_cache: If False skip cached replies and always call the model.
+        stream: If True echo the report to stderr while it is generated.
 
     Returns:
         A refined ``ReviewResult`` or a placeholder when no model is provided.
     """
     logger.debug("self_consistency_review called")
-
-    messages = [
-        {
-            "role": "system",
-            "content": SELF_CRITIQUE_TEMPLATE,
-        },
-        {
-            "role": "user",
-            "content": f"<draft_review>\n{synthesis.to_dict()}\n</draft_review>",
-        },
-    ]
-
-    if not model:
-        logger.debug(
-            "No model provided for self_consistency_review - skipping LLM call"
-        )
-        return review_result_factory("no-model")
-
-    return _execute_llm_call(messages, model, "self-consistency")
+    if is_placeholder(synthesis):
+        logger.info("No synthesized findings to refine - skipping LLM call")
+        return synthesis
+
+    return _run_review(
+        SELF_CRITIQUE_TEMPLATE,
+        f"<draft_review>\n{synthesis.to_dict()}\n</draft_review>",
+        model,
+        "self-consistency",
+        _CallOptions(
+            use_cache=use_cache,
+            stream=stream,
+            max_tokens=_max_tokens("self_consistency"),
+        ),
+    )
 
 
 def analyze_logic(
     diff: str,
     model: Optional[str] = None,
     max_tool_iterations: int = 5,
+    use_cache: bool = True,
+    diff_block: Optional[str] = None,
 ) -> ReviewResult:
     """Analyze the diff for logic and higher-level issues using the LLM.
 
@@ -533,30 +966,30 @@ def analyze_logic(
         diff: Unified diff text to analyze.
         model: Optional LLM model id; if None this returns a placeholder.
         max_tool_iterations: Max tool-call cycles (passed to executor).
+        use_cache: If False skip cached replies and always call the model.
+        diff_block: ``diff`` already wrapped by ``_diff_block``, so
+            phases run over the same diff share one copy; built from
+            ``diff`` when None.
 
     Returns:
         A ``ReviewResult`` produced by the model or a placeholder if no model is provided.
     """
     logger.debug("analyze_logic called")
 
-    # Prepare initial messages
-    messages = [
-        {"role": "system", "content": LOGIC_REVIEW_TEMPLATE},
-        {
-            "role": "user",
-            "content": f"<diff>\n{diff}\n</diff>",
-        },
-    ]
-
-    if not model:
-        logger.debug(
-            "No model provided for analyze_logic - skipping LLM call"
-        )
-        return review_result_factory("no-model")
-
     # Provide tool schemas to the LLM so it can request tool calls
-    tool_schemas = TOOL_REGISTRY.generate_all_tool_schemas()
+    tool_schemas = (
+        TOOL_REGISTRY.generate_all_tool_schemas() if model else None
+    )
 
-    return _execute_llm_call(
-        messages, model, "logic", tool_schemas=tool_schemas
+    return _run_review(
+        LOGIC_REVIEW_TEMPLATE,
+        _diff_block(diff) if diff_block is None else diff_block,
+        model,
+        "logic",
+        _CallOptions(
+            tool_schemas=tool_schemas,
+            max_tool_iterations=max_tool_iterations,
+            use_cache=use_cache,
+            max_tokens=_max_tokens("analyze"),
+        ),
     )
@@ -1,8 +1,9 @@
+import json
 from dataclasses import dataclass, field
 from typing import Any, Literal, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ReviewRequest:
     """Represents a request to run a review pipeline.
 
@@ -21,7 +22,7 @@ class ReviewRequest:
             raise ValueError(f"Invalid mode: {self.mode}")
 
 
-@dataclass
+@dataclass(slots=True)
 class ReviewIssue:
     """Represents a single issue discovered during review."""
 
@@ -45,7 +46,16 @@ class ReviewIssue:
         }
 
 
-@dataclass
+def _markdown_location(issue: ReviewIssue) -> str:
+    """Return the `` (file:line)`` suffix of an issue's Markdown line."""
+    if not issue.file:
+        return ""
+    if issue.line is None:
+        return f" ({issue.file})"
+    return f" ({issue.file}:{issue.line})"
+
+
+@dataclass(slots=True)
 class ReviewResult:
     """Aggregated result from running the review pipeline."""
 
@@ -66,9 +76,11 @@ class ReviewResult:
         The JSON includes the ``summary``, a list of issue objects and the
         suggestions list. Useful for programmatic consumption in CI or
         tooling that expects JSON output from the review command.
-        """
-        import json
 
+        The text keeps the stdlib ``json.dumps`` defaults (spaces after
+        separators, non-ASCII escaped) whether or not ``orjson`` is
+        installed; compact ``json_utils.dumps`` is only used for prompts.
+        """
         return json.dumps(self.to_dict())
 
     def to_markdown(self) -> str:
@@ -78,80 +90,71 @@ class ReviewResult:
         section and suggestions. The format is intentionally simple so the
         output can be rendered on the terminal or saved to a file.
         """
-        lines: list[str] = []
-
-        lines.append("# Review Summary")
-        lines.append("")
-        lines.append(self.summary)
-        lines.append("")
-
-        lines.append(f"## Issues ({len(self.issues)})")
-        lines.append("")
+        lines = [
+            "# Review Summary",
+            "",
+            self.summary,
+            "",
+            f"## Issues ({len(self.issues)})",
+            "",
+        ]
         if self.issues:
-            for issue in self.issues:
-                location = ""
-                if issue.file:
-                    loc = issue.file
-                    if issue.line is not None:
-                        loc += f":" + str(issue.line)
-                    location = f" ({loc})"
-                lines.append(f"- **{issue.severity}**: {issue.description}{location}")
+            lines.extend(
+                f"- **{issue.severity}**: {issue.description}"
+                f"{_markdown_location(issue)}"
+                for issue in self.issues
+            )
         else:
             lines.append("- No issues found")
 
-        lines.append("")
-        lines.append("## Suggestions")
-        lines.append("")
+        lines.extend(("", "## Suggestions", ""))
         if self.suggestions:
-            for s in self.suggestions:
-                lines.append(f"- {s}")
+            lines.extend(f"- {s}" for s in self.suggestions)
         else:
             lines.append("- No suggestions")
 
         return "\n".join(lines)
 
 
+# Error result type -> (summary, issue category, issue description); the
+# texts are formatted with the error message.
+_ERROR_RESULTS = {
+    "auth-error": (
+        "Authentication error - skipping review: {}",
+        "authentication",
+        "Authentication failed: {}",
+    ),
+    "generic-error": (
+        "Generic error - skipping review: {}",
+        "unknown",
+        "Unexpected error: {}",
+    ),
+}
+
+
 def review_result_factory(
     result_type: Literal[
         "no-model", "auth-error", "generic-error"
     ],
     error_message: str = "",
-):
+) -> Optional[ReviewResult]:
+    """Return a new placeholder or error ``ReviewResult`` of ``result_type``.
+
+    Returns None for an unknown ``result_type``.
+    """
     if result_type == "no-model":
-        return ReviewResult(
-            summary="No model provided - skipping review",
-            issues=[],
-            suggestions=[],
-        )
-    elif result_type == "auth-error":
-        return ReviewResult(
-            summary=f"Authentication error - skipping review: {error_message}",
-            issues=[
-                ReviewIssue(
-                    id="",
-                    severity="major",
-                    category="authentication",
-                    description=f"Authentication failed: {error_message}",
-                    file=None,
-                    line=None,
-                    snippet=None,
-                )
-            ],
-            suggestions=[],
-        )
-    elif result_type == "generic-error":
-        return ReviewResult(
-            summary=f"Generic error - skipping review: {error_message}",
-            issues=[
-                ReviewIssue(
-                    id="",
-                    severity="major",
-                    category="unknown",
-                    description=f"Unexpected error: {error_message}",
-                    file=None,
-                    line=None,
-                    snippet=None,
-                )
-            ],
-            suggestions=[],
-        )
+        return ReviewResult(summary="No model provided - skipping review")
+    if result_type not in _ERROR_RESULTS:
+        return None
+    summary, category, description = _ERROR_RESULTS[result_type]
+    return ReviewResult(
+        summary=summary.format(error_message),
+        issues=[
+            ReviewIssue(
+                id="",
+                severity="major",
+                category=category,
+                description=description.format(error_message),
+            )
+        ],
+    )
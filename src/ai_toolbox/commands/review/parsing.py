@@ -0,0 +1,164 @@
+import logging
+import json
+import sys
+from ai_toolbox import json_utils
+from .interfaces import (
+    ReviewResult,
+    ReviewIssue,
+    review_result_factory,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ReviewIssue field -> value used when the model leaves it out
+_ISSUE_DEFAULTS = {
+    "id": "",
+    "severity": "info",
+    "category": "",
+    "description": "",
+    "file": None,
+    "line": None,
+    "snippet": None,
+}
+
+
+# Enum-like issue fields whose values are interned when parsed
+_INTERNED_ISSUE_FIELDS = ("severity", "category")
+
+
+def _review_issue(issue_data: dict) -> ReviewIssue:
+    """Build a ``ReviewIssue`` from one issue object of a model reply."""
+    fields = {**_ISSUE_DEFAULTS, **issue_data}
+    if len(fields) != len(_ISSUE_DEFAULTS):
+        # The model added keys of its own; keep only the known ones
+        fields = {key: fields[key] for key in _ISSUE_DEFAULTS}
+    # Severities and categories repeat across issues; share one string
+    # object per value instead of one per issue.
+    for key in _INTERNED_ISSUE_FIELDS:
+        value = fields[key]
+        if isinstance(value, str):
+            fields[key] = sys.intern(value)
+    return ReviewIssue(**fields)
+
+
+def _review_from_data(data: dict) -> ReviewResult:
+    """Build a ``ReviewResult`` from a decoded review object."""
+    return ReviewResult(
+        summary=data.get("summary", ""),
+        issues=[
+            _review_issue(issue_data)
+            for issue_data in data.get("issues", [])
+        ],
+        suggestions=data.get("suggestions", []),
+    )
+
+
+# Issue categories used only by error results (review_result_factory and
+# parse failures); the review prompts never ask the model for them.
+_ERROR_CATEGORIES = frozenset({"authentication", "unknown", "parsing"})
+_NO_MODEL_SUMMARY = review_result_factory("no-model").summary
+
+
+def is_placeholder(review: ReviewResult) -> bool:
+    """Return True if ``review`` carries no findings from a model.
+
+    That is the ``no-model`` placeholder and the error results of failed
+    or unparsable LLM calls.
+    """
+    if review.suggestions:
+        return False
+    if not review.issues:
+        return review.summary == _NO_MODEL_SUMMARY
+    return all(issue.category in _ERROR_CATEGORIES for issue in review.issues)
+
+
+def parse_review_response(
+    response_content: str, review_name: str = "unknown"
+) -> ReviewResult:
+    """Parse a JSON-formatted review response into a ReviewResult.
+
+    The helper expects ``response_content`` to be a JSON string with keys
+    like ``summary``, ``issues`` and ``suggestions``. On a JSON parsing
+    error it returns a ``ReviewResult`` containing a single parsing issue.
+
+    Args:
+        response_content: JSON string returned by an LLM assistant.
+        review_name: Optional name used for logging/context.
+
+    Returns:
+        A ``ReviewResult`` representing the parsed content or an error result
+        if parsing failed.
+    """
+    try:
+        return _review_from_data(json_utils.loads(response_content))
+    except json.JSONDecodeError as e:
+        # Malformed model output is expected now and then; no traceback
+        logger.error(f"Failed to parse JSON for {review_name}: {e}")
+        return _parsing_error_result(
+            f"Failed to parse JSON for {review_name}: {e}",
+            f"Failed to parse JSON: {e}",
+        )
+    except Exception as e:
+        logger.exception(
+            f"Unexpected error parsing review response for {review_name}: {e}"
+        )
+        return _parsing_error_result(
+            f"Unexpected error parsing review response for {review_name}: {e}",
+            f"Unexpected error: {e}",
+        )
+
+
+def _parsing_error_result(summary: str, description: str) -> ReviewResult:
+    """Return the result reported when a review reply cannot be parsed."""
+    return ReviewResult(
+        summary=summary,
+        issues=[
+            ReviewIssue(
+                id="",
+                severity="major",
+                category="parsing",
+                description=description,
+            )
+        ],
+        suggestions=[],
+    )
+
+
+def parse_persona_batch(
+    persona_names: tuple[str, ...], response_content: str, review_name: str
+) -> dict[str, ReviewResult]:
+    """Split a batched persona reply into one ``ReviewResult`` per persona.
+
+    A reply that is not valid JSON is reported for every persona, as
+    ``parse_review_response`` would report it; a persona missing from
+    the reply gets a parsing error of its own.
+    """
+    try:
+        data = json_utils.loads(response_content)
+    except json.JSONDecodeError:
+        error = parse_review_response(response_content, review_name)
+        return {name: error for name in persona_names}
+
+    results = {}
+    for name in persona_names:
+        persona_data = data.get(name) if isinstance(data, dict) else None
+        if not isinstance(persona_data, dict):
+            logger.error(f"No {name} review in the {review_name} reply")
+            results[name] = _parsing_error_result(
+                f"No {name} review in the {review_name} reply",
+                f"The reply has no review for persona {name}",
+            )
+            continue
+        try:
+            results[name] = _review_from_data(persona_data)
+        except Exception as e:
+            logger.exception(
+                f"Unexpected error parsing {name} review from the "
+                f"{review_name} reply: {e}"
+            )
+            results[name] = _parsing_error_result(
+                f"Unexpected error parsing review response for {name}: {e}",
+                f"Unexpected error: {e}",
+            )
+    return results
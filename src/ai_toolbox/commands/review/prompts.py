@@ -1,33 +1,31 @@
-import textwrap
-
-
-_schema_template = textwrap.dedent(
-    """
-    {{
-        "summary": str,
-        "issues": [
-            {{
-                "id": str,
-                "severity": "critical"|"major"|"minor"|"info",
-                "category": {categories},
-                "description": str,
-                "file": str | null,
-                "line": int | null,
-                "snippet": str | null
-            }}
-        ],
-        "suggestions": list[str],
-    }}
-    """
-)
+# Shared JSON schema block, written pre-dedented so no ``textwrap.dedent``
+# runs at import time. The review templates below are plain literals too:
+# the unindented schema they embed always made dedenting them a no-op, so
+# their text keeps its 4-space indent exactly as before.
+_SCHEMA_TEMPLATE = """
+{{
+    "summary": str,
+    "issues": [
+        {{
+            "id": str,
+            "severity": "critical"|"major"|"minor"|"info",
+            "category": {categories},
+            "description": str,
+            "file": str | null,
+            "line": int | null,
+            "snippet": str | null
+        }}
+    ],
+    "suggestions": list[str],
+}}
+"""
 
 # Prompt template for syntax-focused reviews.
 # The assistant must act as an automated linter: check only for syntax errors,
 # PEP 8 violations, and common code smells. It MUST ignore logical or algorithmic
 # issues. The assistant's entire response must be formatted using the exact
 # wrapper tags shown below and nothing else: [ANALYSIS]...[/ANALYSIS][SUGGESTIONS]...[/SUGGESTIONS]
-SYNTAX_REVIEW_TEMPLATE = textwrap.dedent(
-    f"""
+SYNTAX_REVIEW_TEMPLATE = f"""
     You are an automated code linter. Your only responsibilities are:
 
     1. Detect syntax errors (invalid Python syntax) in the provided code or diff.
@@ -43,11 +41,10 @@ SYNTAX_REVIEW_TEMPLATE = textwrap.dedent(
     IMPORTANT: Return your response as a JSON object with
     this exact schema:
 
-    {_schema_template.format(
-        categories='"syntax"|"style"|"code-smell"'
-    )}
-    """
-)
+{_SCHEMA_TEMPLATE.format(
+    categories='"syntax"|"style"|"code-smell"'
+)}
+"""
 
 
 # Prompt template for logic-focused reviews.
@@ -55,8 +52,7 @@ SYNTAX_REVIEW_TEMPLATE = textwrap.dedent(
 # chain-of-thought process: understand goal, analyze logic line-by-line,
 # then formulate suggestions. The response MUST be formatted exactly using the
 # wrapper tags: [ANALYSIS]...[/ANALYSIS][SUGGESTIONS]...[/SUGGESTIONS]
-LOGIC_REVIEW_TEMPLATE = textwrap.dedent(
-    f"""
+LOGIC_REVIEW_TEMPLATE = f"""
     You are a senior software architect. Review the provided code or diff with
     a focus on logical correctness, potential bugs, missed edge cases, and
     adherence to software design and Python best practices.
@@ -78,11 +74,10 @@ LOGIC_REVIEW_TEMPLATE = textwrap.dedent(
     IMPORTANT: Return your response as a JSON object with
     this exact schema:
 
-    {_schema_template.format(
-        categories='"logic"|"design"|"security"|"performance"'
-    )}
-    """
-)
+{_SCHEMA_TEMPLATE.format(
+    categories='"logic"|"design"|"security"|"performance"'
+)}
+"""
 
 # Severity levels and rules to be interpolated into prompts
 SEVERITY_RULES = {
@@ -97,8 +92,7 @@ SEVERITY_RULES = {
 # Each persona should follow the same exact output formatting requirement as
 # other review templates: the assistant must return exactly `[ANALYSIS]...[/ANALYSIS][SUGGESTIONS]...[/SUGGESTIONS]`.
 
-PERFORMANCE_REVIEW_TEMPLATE = textwrap.dedent(
-    f"""
+PERFORMANCE_REVIEW_TEMPLATE = f"""
     You are a performance specialist. Review the provided code or diff with a focus
     on algorithmic complexity, memory usage, potential bottlenecks, and opportunities
     for optimization.
@@ -111,15 +105,13 @@ PERFORMANCE_REVIEW_TEMPLATE = textwrap.dedent(
     IMPORTANT: Return your response as a JSON object with
     this exact schema:
 
-    {_schema_template.format(
-        categories='"performance"|"complexity"|"memory"|"bottleneck"'
-    )}
-    """
-)
+{_SCHEMA_TEMPLATE.format(
+    categories='"performance"|"complexity"|"memory"|"bottleneck"'
+)}
+"""
 
 
-MAINTAINABILITY_REVIEW_TEMPLATE = textwrap.dedent(
-    f"""
+MAINTAINABILITY_REVIEW_TEMPLATE = f"""
     You are a maintainability expert. Review the provided code or diff with a focus
     on clarity, readability, naming, documentation, tests, and how easy the code
     is to modify and extend in the future.
@@ -132,15 +124,13 @@ MAINTAINABILITY_REVIEW_TEMPLATE = textwrap.dedent(
     IMPORTANT: Return your response as a JSON object with
     this exact schema:
 
-    {_schema_template.format(
-        categories='"maintainability"|"readability"|"documentation"'
-    )}
-    """
-)
+{_SCHEMA_TEMPLATE.format(
+    categories='"maintainability"|"readability"|"documentation"'
+)}
+"""
 
 
-SECURITY_REVIEW_TEMPLATE = textwrap.dedent(
-    f"""
+SECURITY_REVIEW_TEMPLATE = f"""
     You are a skeptical security analyst. Review the provided code or diff with a focus
     on vulnerabilities, unsafe patterns, input validation, secrets management, and
     potential attack vectors.
@@ -153,16 +143,30 @@ SECURITY_REVIEW_TEMPLATE = textwrap.dedent(
     IMPORTANT: Return your response as a JSON object with
     this exact schema:
 
-    {_schema_template.format(
-        categories='"security"|"vulnerability"|"validation"|"secrets"'
-    )}
-    """
-)
+{_SCHEMA_TEMPLATE.format(
+    categories='"security"|"vulnerability"|"validation"|"secrets"'
+)}
+"""
+
+
+# Batched persona template: one request covering several personas. Filled
+# with ``str.format``: ``names`` lists the persona keys and ``personas``
+# holds each persona's own template wrapped in a <persona> tag.
+BATCHED_PERSONA_REVIEW_TEMPLATE = """
+    You are a panel of specialist code reviewers. Review the provided code or
+    diff once for each persona described below. Keep the reviews independent:
+    each one follows only its own persona's instructions and focus.
+
+    IMPORTANT: Return your response as a single JSON object with exactly one
+    key per persona ({names}). The value of each key is that persona's review,
+    a JSON object with the schema given in the persona's instructions.
+
+{personas}
+"""
 
 
 # Synthesis template: lead software architect persona to combine multiple reviews
-SYNTHESIS_TEMPLATE = textwrap.dedent(
-    f"""
+SYNTHESIS_TEMPLATE = f"""
     You are a lead software architect tasked with synthesizing multiple specialist
     reviews into a single, comprehensive, and de-duplicated report. You will be
     provided with reviews from PERFORMANCE, MAINTAINABILITY, and SECURITY
@@ -172,15 +176,13 @@ SYNTHESIS_TEMPLATE = textwrap.dedent(
     IMPORTANT: Return your response as a JSON object with
     this exact schema:
 
-    {_schema_template.format(
-        categories='"Combined category from specialists"'
-    )}
-    """
-)
+{_SCHEMA_TEMPLATE.format(
+    categories='"Combined category from specialists"'
+)}
+"""
 
 
-SELF_CRITIQUE_TEMPLATE = textwrap.dedent(
-    f"""
+SELF_CRITIQUE_TEMPLATE = f"""
     You are a principal software architect, known for concise, clear, and highly actionable feedback.
 
     Task: Critique and refine the draft code review provided. Your goals are:
@@ -195,8 +197,7 @@ SELF_CRITIQUE_TEMPLATE = textwrap.dedent(
     IMPORTANT: Return your response as a JSON object with
     this exact schema:
 
-    {_schema_template.format(
-        categories='"refined categories"'
-    )}
-    """
-)
+{_SCHEMA_TEMPLATE.format(
+    categories='"refined categories"'
+)}
+"""
@@ -0,0 +1,153 @@
+import logging
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from ai_toolbox import json_utils
+from ai_toolbox.tool_utils import TOOL_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on tool calls from one model turn that run concurrently
+MAX_TOOL_WORKERS = 8
+
+
+def _assistant_message(model_message: Any) -> dict:
+    """Project a tool-calling reply onto a plain wire-format message.
+
+    Keeping litellm's ``Message`` object in the conversation would retain
+    its extra fields across turns and make every later request serialize
+    the full object again; only role, content and tool calls are needed.
+    """
+    return {
+        "role": "assistant",
+        "content": model_message.content,
+        "tool_calls": [
+            {
+                "id": tool_call.id,
+                "type": "function",
+                "function": {
+                    "name": tool_call.function.name,
+                    "arguments": tool_call.function.arguments,
+                },
+            }
+            for tool_call in model_message.tool_calls
+        ],
+    }
+
+
+def _call_tool(tool_name: str, args: dict) -> tuple[Any, bool]:
+    """Run one tool through ``TOOL_REGISTRY``.
+
+    Returns:
+        ``(result, ok)``; on failure ``result`` is an error string for the
+        model and ``ok`` is False so the result is not reused.
+    """
+    try:
+        return TOOL_REGISTRY.call_tool(tool_name, **args), True
+    except KeyError:
+        return f"<error: tool not found: {tool_name}>", False
+    except Exception as e:
+        return f"<error: tool execution failed: {e}>", False
+
+
+def _run_tool_calls(jobs) -> list[tuple[Any, bool]]:
+    """Run ``(tool name, args)`` jobs concurrently; results keep job order.
+
+    Uses a short-lived pool of its own: this runs inside review phases that
+    already occupy the shared LLM executor, and waiting on that pool from
+    one of its workers could deadlock it.
+    """
+    jobs = list(jobs)
+    if len(jobs) <= 1:
+        return [_call_tool(name, args) for name, args in jobs]
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_TOOL_WORKERS, len(jobs)),
+        thread_name_prefix="ai-toolbox-tool",
+    ) as executor:
+        return list(executor.map(lambda job: _call_tool(*job), jobs))
+
+
+def _parse_tool_call(tool_call: Any) -> tuple[str, dict, bool, tuple]:
+    """Return ``(tool name, args, cacheable, cache key)`` of one tool call.
+
+    Arguments that are not valid JSON are treated as no arguments.
+    """
+    tool_name = tool_call.function.name
+    raw_tool_args = tool_call.function.arguments
+    try:
+        args = json_utils.loads(raw_tool_args) if raw_tool_args else {}
+    except json.JSONDecodeError:
+        args = {}
+    tool = TOOL_REGISTRY.get_tool(tool_name)
+    cacheable = tool is not None and tool.cacheable
+    tool_key = (tool_name, json.dumps(args, sort_keys=True))
+    return tool_name, args, cacheable, tool_key
+
+
+def _plan_jobs(
+    calls: list[tuple], tool_cache: dict
+) -> dict[Any, tuple[str, dict]]:
+    """Return the tool runs needed by parsed ``calls``, keyed for lookup.
+
+    One job per distinct cacheable call missing from ``tool_cache``, keyed
+    by its cache key, and one per non-cacheable call, keyed by its index.
+    """
+    jobs: dict[Any, tuple[str, dict]] = {}
+    for index, (tool_name, args, cacheable, tool_key) in enumerate(calls):
+        if not cacheable:
+            jobs[index] = (tool_name, args)
+        elif tool_key in tool_cache:
+            logger.debug(f"Reusing cached result of {tool_name}")
+        elif tool_key not in jobs:
+            jobs[tool_key] = (tool_name, args)
+    return jobs
+
+
+def run_tool_turn(
+    model_message: Any, tool_cache: dict[tuple[str, str], str]
+) -> list[dict]:
+    """Run the tool calls of one model reply and return the resulting turn.
+
+    The turn is the assistant message followed by one tool message per
+    call, in call order, ready to be appended to the conversation in one
+    ``extend``. Every call is parsed first so cache hits and repeats within
+    the turn are resolved before anything runs; the remaining calls run
+    concurrently. Successful results of cacheable tools are added to
+    ``tool_cache`` and reused when the model repeats a call with the same
+    arguments.
+
+    Args:
+        model_message: Assistant message of the reply, with ``tool_calls``.
+        tool_cache: ``(tool name, canonical JSON args)`` -> result, shared
+            by the turns of one review.
+
+    Returns:
+        The messages of the turn.
+    """
+    tool_calls = model_message.tool_calls
+    calls = [_parse_tool_call(tool_call) for tool_call in tool_calls]
+    jobs = _plan_jobs(calls, tool_cache)
+    job_results = dict(zip(jobs, _run_tool_calls(jobs.values())))
+
+    turn = [_assistant_message(model_message)]
+    for index, (tool_call, call) in enumerate(zip(tool_calls, calls)):
+        tool_name, _, cacheable, tool_key = call
+        if not cacheable:
+            tool_result, _ = job_results[index]
+        elif tool_key in tool_cache:
+            tool_result = tool_cache[tool_key]
+        else:
+            tool_result, ok = job_results[tool_key]
+            if ok:
+                tool_cache[tool_key] = tool_result
+
+        # Add the tool result so the LLM can consume it
+        turn.append(
+            {
+                "role": "tool",
+                "name": tool_name,
+                "content": str(tool_result),
+                "tool_call_id": tool_call.id,
+            }
+        )
+    return turn
@@ -0,0 +1,63 @@
+"""Helpers for working with unified diff text.
+
+Shared by the commands that condense or split ``git diff`` output before
+sending it to an LLM. All functions operate on plain strings and never
+call git.
+"""
+
+import re
+
+# ``diff --git a/<path> b/<path>`` file headers; group 1 is the new path
+DIFF_HEADER_RE = re.compile(r"^diff --git a/.* b/(.*)$", re.MULTILINE)
+
+
+def iter_file_sections(diff: str):
+    """Yield ``(path, section)`` for each file in a unified diff.
+
+    Sections start at their ``diff --git`` header and exclude the newline
+    separating them from the next file. Any text before the first header
+    is yielded with an empty path.
+    """
+    matches = list(DIFF_HEADER_RE.finditer(diff))
+    if not matches:
+        yield "", diff
+        return
+    if matches[0].start() > 0:
+        yield "", diff[: matches[0].start() - 1]
+    ends = [match.start() - 1 for match in matches[1:]] + [len(diff)]
+    for match, end in zip(matches, ends):
+        yield match.group(1), diff[match.start() : end]
+
+
+def split_diff(diff: str, max_chars: int) -> list[str]:
+    """Split ``diff`` into chunks of whole files of at most ``max_chars``.
+
+    Consecutive file sections are packed into the same chunk while they
+    fit. A single file larger than ``max_chars`` becomes a chunk of its
+    own rather than being cut mid-hunk. A diff that already fits is
+    returned as the only chunk, unchanged.
+
+    Args:
+        diff: Unified diff text.
+        max_chars: Target maximum size of each chunk.
+
+    Returns:
+        The chunks in diff order; joining them with newlines restores
+        ``diff``.
+    """
+    if len(diff) <= max_chars:
+        return [diff]
+
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for _, section in iter_file_sections(diff):
+        # +1 for the newline that joins sections back together
+        if current and size + 1 + len(section) > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        size += len(section) + (1 if current else 0)
+        current.append(section)
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
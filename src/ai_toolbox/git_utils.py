@@ -5,10 +5,72 @@ keeps error shapes similar to the previous subprocess-based code so
 tests and callers can remain simple.
 """
 
+import os
+from functools import lru_cache
 from typing import Optional
 from git import Repo
 
 
+@lru_cache(maxsize=None)
+def _open_repo(repo_path: str) -> Repo:
+    """Return a ``Repo`` handle for ``repo_path``, reused across calls.
+
+    Opening a repository walks the filesystem to discover the git dir and
+    sets up GitPython's command wrapper; its persistent ``git cat-file``
+    workers also live on the handle. Reusing the handle keeps those costs
+    to once per process.
+
+    Args:
+        repo_path: Absolute repository path (callers normalize it).
+    """
+    return Repo(repo_path)
+
+
+def _get_repo(path: Optional[str] = None) -> Repo:
+    """Return the cached ``Repo`` for ``path`` (default: current directory)."""
+    return _open_repo(os.path.abspath(path or "."))
+
+
+def get_staged_fingerprint(path: Optional[str] = None) -> str:
+    """Return a cheap fingerprint of the repository's staged state.
+
+    The fingerprint combines the commit ``HEAD`` points to with the size
+    and modification time of the index file. Staging, unstaging or
+    committing changes all rewrite at least one of those, so callers can
+    use the value as a cache key for the staged diff. Unlike
+    ``git write-tree`` it is computed without spawning a git process.
+
+    Args:
+        path: Optional repository path. Defaults to the current working directory.
+
+    Returns:
+        An opaque string identifying the current staged state.
+
+    Raises:
+        git.InvalidGitRepositoryError: if the path is not a Git repository
+        FileNotFoundError: if the repository has no index yet
+    """
+    repo = _get_repo(path)
+    index_stat = os.stat(os.path.join(repo.git_dir, "index"))
+    try:
+        head = repo.head.commit.hexsha
+    except ValueError:
+        # Unborn branch: no commit exists yet
+        head = ""
+    return f"{head}:{index_stat.st_size}:{index_stat.st_mtime_ns}"
+
+
+def _decode_output(output: bytes) -> str:
+    """Decode raw git output as UTF-8 in a single pass.
+
+    Diffs are requested as bytes and decoded here with ``errors="replace"``
+    so binary or mis-encoded content turns into replacement characters
+    instead of lone surrogates that fail later when the text is echoed or
+    serialized into an LLM request.
+    """
+    return output.decode("utf-8", errors="replace")
+
+
 def _get_staged_diff(path: Optional[str] = None) -> str:
     """Return the repository's staged diff as a unified diff string.
 
@@ -25,12 +87,10 @@ def _get_staged_diff(path: Optional[str] = None) -> str:
         git.InvalidGitRepositoryError / git.GitCommandError: if the path is not a Git repository
         FileNotFoundError: if the underlying git binary or environment is missing
     """
-    repo_path = path or "."
-
-    repo = Repo(repo_path)
+    repo = _get_repo(path)
     # Use the git command interface to get the same textual diff
-    diff_text = repo.git.diff("--staged")
-    return diff_text
+    diff_bytes = repo.git.diff("--staged", stdout_as_string=False)
+    return _decode_output(diff_bytes)
 
 
 def _get_uncommitted_diff(path: Optional[str] = None) -> str:
@@ -45,11 +105,9 @@ def _get_uncommitted_diff(path: Optional[str] = None) -> str:
     Returns:
         A unified diff string of uncommitted changes (empty if none).
     """
-    repo_path = path or "."
-
-    repo = Repo(repo_path)
-    diff_text = repo.git.diff()
-    return diff_text
+    repo = _get_repo(path)
+    diff_bytes = repo.git.diff(stdout_as_string=False)
+    return _decode_output(diff_bytes)
 
 
 def get_diff(
@@ -84,7 +142,5 @@ def run_commit(message: str, path: Optional[str] = None) -> None:
         mirrors the behavior of calling ``git commit -m ...``. It does not
         stage files — the caller is expected to have staged the intended changes.
     """
-    repo_path = path or "."
-
-    repo = Repo(repo_path)
+    repo = _get_repo(path)
     repo.git.commit(m=message)
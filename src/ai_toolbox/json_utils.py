@@ -0,0 +1,61 @@
+"""JSON encoding and decoding with an optional ``orjson`` fast path.
+
+``orjson`` is not a dependency; when it is installed ``loads`` and
+``dumps`` use it, otherwise they fall back to the standard library.
+Decode errors are ``json.JSONDecodeError`` either way (orjson's error
+type subclasses it), so callers keep catching the stdlib exception.
+
+``dumps`` output is compact (no whitespace after separators) and keeps
+non-ASCII text unescaped with either backend, so strings, numbers, lists,
+dicts and dataclasses encode to the same text whichever is installed.
+It is meant for JSON embedded in prompts. Cache keys and user-facing
+output such as ``ReviewResult.to_json`` still use ``json.dumps``, so they
+never depend on this module's choices.
+"""
+
+import dataclasses
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _encode_default(obj: Any) -> Any:
+    """Encode dataclass instances for the stdlib, as orjson does natively."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(
+        f"Object of type {type(obj).__name__} is not JSON serializable"
+    )
+
+
+def dumps(obj: Any) -> str:
+    """Encode ``obj`` as a compact JSON string.
+
+    Dataclass instances are serialized field by field. Values orjson
+    rejects (e.g. integers wider than 64 bits) fall back to the stdlib.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            # orjson.JSONEncodeError subclasses TypeError
+            pass
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=_encode_default,
+    )
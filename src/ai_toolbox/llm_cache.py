@@ -0,0 +1,110 @@
+"""Small on-disk cache for LLM output.
+
+Entries are JSON files stored under ``<cache dir>/<namespace>/<key>.json``
+where ``key`` is a SHA-256 digest of the inputs that produced the output.
+One file per entry keeps lookups O(1) without loading a shared index, and
+writes go through a temporary file plus ``os.replace`` so concurrent runs
+never observe a half-written entry.
+
+The cache is best-effort: read and write failures are logged and treated
+as misses so a broken cache directory never breaks a command.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "AI_TOOLBOX_CACHE_DIR"
+
+
+def cache_dir() -> str:
+    """Return the root directory of the cache.
+
+    ``$AI_TOOLBOX_CACHE_DIR`` wins when set; otherwise the cache lives in
+    ``ai_toolbox`` under ``$XDG_CACHE_HOME`` (default ``~/.cache``).
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "ai_toolbox")
+
+
+def make_key(*parts: str) -> str:
+    """Return a stable cache key for the given input strings.
+
+    Parts are separated by a NUL byte before hashing so ``("ab", "c")``
+    and ``("a", "bc")`` produce different keys.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8", errors="surrogatepass"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _entry_path(namespace: str, key: str) -> str:
+    return os.path.join(cache_dir(), namespace, f"{key}.json")
+
+
+def load(
+    namespace: str, key: str, max_age: Optional[float] = None
+) -> Optional[Any]:
+    """Return the value stored for ``key``, or None on a miss.
+
+    Args:
+        namespace: Sub-directory separating different kinds of entries.
+        key: Entry key, usually built with ``make_key``.
+        max_age: Optional age limit in seconds; entries written longer ago
+            (by file modification time) count as misses.
+
+    Returns:
+        The decoded JSON value, or None if the entry is missing, expired
+        or unreadable.
+    """
+    path = _entry_path(namespace, key)
+    try:
+        with open(path, encoding="utf-8") as handle:
+            if max_age is not None:
+                age = time.time() - os.fstat(handle.fileno()).st_mtime
+                if age > max_age:
+                    logger.debug("Cache entry %s expired", path)
+                    return None
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug("Ignoring unreadable cache entry %s: %s", path, e)
+        return None
+
+
+def store(namespace: str, key: str, value: Any) -> None:
+    """Persist ``value`` (JSON-serializable) for ``key``.
+
+    Args:
+        namespace: Sub-directory separating different kinds of entries.
+        key: Entry key, usually built with ``make_key``.
+        value: Value to store; replaces any existing entry atomically.
+    """
+    path = _entry_path(namespace, key)
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(value, handle)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Could not write cache entry %s: %s", path, e)
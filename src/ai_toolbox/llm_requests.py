@@ -0,0 +1,212 @@
+"""Request plumbing shared by the LLM-driven commands.
+
+Caps how many LLM requests are in flight at once in this process, echoes
+streamed replies while they are generated and derives the ``llm_cache``
+key of a request. None of this depends on what a command asks the model,
+so it lives next to ``llm_utils`` and ``llm_cache`` rather than in a
+command.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional
+
+from ai_toolbox import json_utils, llm_cache
+
+logger = logging.getLogger(__name__)
+
+INFLIGHT_LIMIT_ENV = "AI_TOOLBOX_LLM_INFLIGHT_LIMIT"
+
+# Default upper bound on LLM requests in flight at once in this process,
+# across worker pools and the main thread; override with
+# AI_TOOLBOX_LLM_INFLIGHT_LIMIT to match a provider's concurrency limit.
+LLM_INFLIGHT_LIMIT = 8
+
+# Streamed replies are written straight to stderr and flushed at each
+# newline or after this many deltas, whichever comes first
+STREAM_FLUSH_EVERY = 8
+
+
+@lru_cache(maxsize=None)
+def inflight_semaphore() -> threading.BoundedSemaphore:
+    """Return the semaphore capping concurrent LLM requests.
+
+    Sized from ``$AI_TOOLBOX_LLM_INFLIGHT_LIMIT`` on first use; invalid or
+    non-positive values are logged and ``LLM_INFLIGHT_LIMIT`` is used.
+    """
+    limit = LLM_INFLIGHT_LIMIT
+    override = os.environ.get(INFLIGHT_LIMIT_ENV)
+    if override:
+        try:
+            limit = int(override)
+            if limit < 1:
+                raise ValueError(override)
+        except ValueError:
+            logger.warning(
+                "Ignoring invalid %s=%r", INFLIGHT_LIMIT_ENV, override
+            )
+            limit = LLM_INFLIGHT_LIMIT
+    return threading.BoundedSemaphore(limit)
+
+
+@contextmanager
+def inflight_slot(name: str) -> Iterator[None]:
+    """Hold one in-flight LLM request slot for the duration of the block.
+
+    ``name`` only identifies the waiting request in debug logs.
+    """
+    semaphore = inflight_semaphore()
+    if not semaphore.acquire(blocking=False):
+        logger.debug("%s waiting for an in-flight LLM slot", name)
+        semaphore.acquire()
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+class InflightStream:
+    """Iterate a streamed completion while holding its in-flight slot.
+
+    The slot is released once the stream is exhausted, fails or is closed,
+    whichever happens first.
+    """
+
+    __slots__ = ("_stream", "_release")
+
+    def __init__(self, stream: Any, release: Callable[[], Any]) -> None:
+        self._stream = stream
+        self._release: Optional[Callable[[], Any]] = release
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            yield from self._stream
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close the underlying stream and release the slot (idempotent)."""
+        release, self._release = self._release, None
+        if release is None:
+            return
+        try:
+            close = getattr(self._stream, "close", None)
+            if callable(close):
+                close()
+        finally:
+            release()
+
+
+class JsonObjectScanner:
+    """Detect when streamed text closes a top-level JSON object.
+
+    Tracks brace depth outside string literals incrementally, so each
+    chunk is scanned once. Stray closing braces in surrounding prose are
+    ignored rather than driving the depth negative.
+    """
+
+    __slots__ = ("depth", "in_string", "escaped")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Scan ``text``; return True if it closed a top-level object."""
+        closed = False
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}" and self.depth > 0:
+                self.depth -= 1
+                closed = closed or self.depth == 0
+        return closed
+
+
+def is_json(text: str) -> bool:
+    """Return True if ``text`` is a valid JSON document."""
+    try:
+        json_utils.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+def stream_to_stderr(response: Any) -> str:
+    """Echo a streaming completion as it arrives and return the full text.
+
+    The raw reply goes to stderr: it is progress for the user watching the
+    terminal, while stdout only carries the formatted report, so
+    ``review --output json`` stays parseable.
+
+    Reading stops as soon as the reply holds a complete JSON object, so
+    trailing output the caller would discard is neither waited for nor
+    echoed. The buffer is only parsed when a chunk closes a top-level
+    object, so prose around the JSON doesn't re-parse it on every chunk.
+    """
+    parts: list[str] = []
+    stderr = sys.stderr
+    pending = 0
+    scanner = JsonObjectScanner()
+    try:
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            if not delta:
+                continue
+            parts.append(delta)
+            stderr.write(delta)
+            pending += 1
+            if pending >= STREAM_FLUSH_EVERY or "\n" in delta:
+                stderr.flush()
+                pending = 0
+            if scanner.feed(delta) and is_json("".join(parts)):
+                break
+    finally:
+        # Ends the provider stream early and frees its in-flight slot
+        close = getattr(response, "close", None)
+        if callable(close):
+            close()
+    stderr.write("\n")
+    stderr.flush()
+    return "".join(parts)
+
+
+def request_cache_key(
+    model: str,
+    messages: list[dict],
+    tool_schemas: list[dict] | None,
+    max_tokens: int | None,
+    response_format: dict | None,
+) -> str:
+    """Return the llm_cache key for a completion request.
+
+    Messages, schemas and the response format are serialized as canonical
+    JSON (sorted keys, no whitespace) with the stdlib encoder, so equal
+    requests always hash to the same key whether or not orjson is
+    installed. The token cap is part of the key so that raising it does
+    not keep serving replies truncated under the old cap.
+    """
+    return llm_cache.make_key(
+        model,
+        json.dumps(messages, sort_keys=True, separators=(",", ":")),
+        json.dumps(tool_schemas, sort_keys=True, separators=(",", ":")),
+        str(max_tokens),
+        json.dumps(response_format, sort_keys=True, separators=(",", ":")),
+    )
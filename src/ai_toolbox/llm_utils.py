@@ -0,0 +1,133 @@
+"""Helpers shared by the LLM-driven commands.
+
+Keeps provider-specific request details (such as prompt caching hints) in
+one place so the commands can keep building plain chat messages, and
+defers importing litellm until a command actually talks to a model.
+"""
+
+import sys
+from functools import lru_cache
+from typing import Any, Optional
+
+
+# Model id prefixes of providers that only cache a prompt prefix when it is
+# explicitly marked with ``cache_control``. OpenAI-style providers cache
+# long, byte-identical prefixes automatically and need no marker.
+_EXPLICIT_CACHE_PREFIXES = (
+    "anthropic/",
+    "claude",
+    "bedrock/anthropic",
+    "vertex_ai/claude",
+)
+
+
+def supports_cache_control(model: str) -> bool:
+    """Return True if ``model`` needs explicit ``cache_control`` markers."""
+    return model.startswith(_EXPLICIT_CACHE_PREFIXES)
+
+
+def cacheable_message(
+    role: str, content: str, model: str
+) -> dict[str, Any]:
+    """Build a chat message whose content the provider may cache.
+
+    For providers that require it (see ``supports_cache_control``) the text
+    is wrapped in a content block carrying an ephemeral ``cache_control``
+    marker so repeated requests reuse the processed prefix. Other providers
+    get a plain string message.
+
+    Args:
+        role: Chat role of the message (``system``, ``user``...).
+        content: Message text; should be identical across requests.
+        model: LLM model id the message will be sent to.
+
+    Returns:
+        A message dict suitable for ``litellm.completion``.
+    """
+    if supports_cache_control(model):
+        return {
+            "role": role,
+            "content": [
+                {
+                    "type": "text",
+                    "text": content,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        }
+    return {"role": role, "content": content}
+
+
+def completion(*args: Any, **kwargs: Any) -> Any:
+    """Call ``litellm.completion``, importing litellm on first use.
+
+    Importing litellm pulls in its provider SDKs and takes well over a
+    second, so commands call it through this wrapper instead of importing
+    it at module level. ``--help`` and code paths that never reach a model
+    don't pay for the import.
+    """
+    from litellm import completion as litellm_completion
+
+    return litellm_completion(*args, **kwargs)
+
+
+def count_tokens(model: str, text: str) -> int:
+    """Return the number of prompt tokens ``text`` takes for ``model``.
+
+    Uses litellm's tokenizer for the model (falling back to a generic one
+    for unknown models); imports litellm on first use.
+    """
+    from litellm import token_counter
+
+    return token_counter(model=model, text=text)
+
+
+@lru_cache(maxsize=None)
+def max_input_tokens(model: str) -> Optional[int]:
+    """Return the context window of ``model`` in tokens, or None if unknown.
+
+    Looked up once per model in litellm's model map.
+    """
+    from litellm import get_model_info
+
+    try:
+        return get_model_info(model).get("max_input_tokens")
+    except Exception:
+        return None
+
+
+def is_authentication_error(error: BaseException) -> bool:
+    """Return True if ``error`` is a litellm ``AuthenticationError``.
+
+    The check never imports litellm: if litellm hasn't been imported yet,
+    the error cannot have come from it.
+    """
+    exceptions = sys.modules.get("litellm.exceptions")
+    return exceptions is not None and isinstance(
+        error, exceptions.AuthenticationError
+    )
+
+
+# litellm exceptions worth retrying: rate limits, dropped connections,
+# timeouts and provider-side 5xx errors
+_TRANSIENT_ERROR_NAMES = (
+    "RateLimitError",
+    "APIConnectionError",
+    "Timeout",
+    "ServiceUnavailableError",
+    "InternalServerError",
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Return True if ``error`` is a litellm error that may succeed on retry.
+
+    Like ``is_authentication_error`` this never imports litellm.
+    """
+    exceptions = sys.modules.get("litellm.exceptions")
+    if exceptions is None:
+        return False
+    return isinstance(
+        error,
+        tuple(getattr(exceptions, name) for name in _TRANSIENT_ERROR_NAMES),
+    )
@@ -3,8 +3,8 @@ import logging
 from textwrap import dedent
 from typing import Any
 from dotenv import load_dotenv
-from litellm import completion
-from litellm.exceptions import AuthenticationError
+
+from .llm_utils import completion, is_authentication_error
 
 from .commands import commit
 from .commands import review
@@ -49,7 +49,8 @@ def setup_logging(verbose: bool = False) -> None:
     )
 
     logger.debug(
-        f"Logging configured with level: {logging.getLevelName(log_level)}"
+        "Logging configured with level: %s",
+        logging.getLevelName(log_level),
     )
 
 
@@ -90,8 +91,8 @@ def cli(ctx: click.Context, verbose: bool, model: str) -> None:
     # Set up logging based on verbosity
     setup_logging(verbose=verbose)
     logger.info("AI Toolbox CLI started")
-    logger.debug(f"Verbose mode: {verbose}")
-    logger.debug(f"Using model: {model}")
+    logger.debug("Verbose mode: %s", verbose)
+    logger.debug("Using model: %s", model)
 
 
 @click.command()
@@ -114,7 +115,7 @@ def hello(ctx: click.Context) -> None:
 
     # Get model from context
     model = ctx.obj.get("model", "openai/gpt-4o-mini")
-    logger.debug(f"Using model for hello command: {model}")
+    logger.debug("Using model for hello command: %s", model)
 
     prompt = dedent(
         """
@@ -123,7 +124,7 @@ def hello(ctx: click.Context) -> None:
         """
     )
 
-    logger.debug(f"Generated prompt: {prompt.strip()}")
+    logger.debug("Generated prompt: %s", prompt.strip())
 
     try:
         logger.debug(
@@ -141,19 +142,21 @@ def hello(ctx: click.Context) -> None:
         for chunk in response:
             content = chunk.choices[0].delta.content
             if content:
-                logger.debug(f"Received chunk: {repr(content)}")
+                logger.debug("Received chunk: %r", content)
                 click.echo(content, nl=False)
         click.echo()
         logger.info("Hello command completed successfully")
 
-    except AuthenticationError as e:
-        logger.error(f"Authentication failed: {e}")
-        click.echo(
-            "Authentication failed. Please check your API key."
-        )
     except Exception as e:
+        if is_authentication_error(e):
+            logger.error("Authentication failed: %s", e)
+            click.echo(
+                "Authentication failed. Please check your API key."
+            )
+            return
         logger.error(
-            f"Unexpected error in hello command: {e}",
+            "Unexpected error in hello command: %s",
+            e,
             exc_info=True,
         )
         click.echo(f"Error generating greeting: {e}")
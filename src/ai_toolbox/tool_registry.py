@@ -26,6 +26,9 @@ class ToolDescriptor:
     func: t.Callable
     description: str
     params_schema: dict
+    # False for tools with side effects; callers may reuse the result of a
+    # cacheable tool called again with the same arguments
+    cacheable: bool = True
 
 
 def _pytype_to_json_type(py: type) -> str:
@@ -102,14 +105,21 @@ class ToolRegistry:
 
     def __init__(self) -> None:
         self._registry: dict[str, ToolDescriptor] = {}
+        # Built on first use, dropped whenever a tool is registered
+        self._all_schemas: list[dict] | None = None
 
     def register_tool(
         self,
         name: str | None = None,
         description: str | None = None,
         params_schema: dict | None = None,
+        cacheable: bool = True,
     ):
-        """Decorator / programmatic registration bound to this registry instance."""
+        """Decorator / programmatic registration bound to this registry instance.
+
+        Pass ``cacheable=False`` for tools with side effects so their results
+        are never reused for repeated calls.
+        """
 
         def decorator(
             func: t.Callable[P, R],
@@ -122,7 +132,9 @@ class ToolRegistry:
                 func=func,
                 description=desc,
                 params_schema=schema,
+                cacheable=cacheable,
             )
+            self._all_schemas = None
             return func
 
         return decorator
@@ -147,12 +159,19 @@ class ToolRegistry:
         }
 
     def generate_all_tool_schemas(self) -> list[dict]:
-        schemas: list[dict] = []
-        for name in self.list_tools():
-            s = self.generate_tool_schema(name)
-            if s is not None:
-                schemas.append(s)
-        return schemas
+        """Return the schemas of all registered tools.
+
+        The list is built once and shared until the next registration, so
+        callers must not mutate it.
+        """
+        if self._all_schemas is None:
+            schemas: list[dict] = []
+            for name in self.list_tools():
+                s = self.generate_tool_schema(name)
+                if s is not None:
+                    schemas.append(s)
+            self._all_schemas = schemas
+        return self._all_schemas
 
     def call_tool(self, name: str, /, **kwargs):
         td = self.get_tool(name)
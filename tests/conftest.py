@@ -0,0 +1,33 @@
+import importlib
+
+import pytest
+
+from ai_toolbox import git_utils, llm_cache
+
+# ``ai_toolbox.commands.commit`` is shadowed by the click command of the same
+# name in the package namespace, so resolve the module explicitly.
+commit_module = importlib.import_module("ai_toolbox.commands.commit")
+
+
+@pytest.fixture(autouse=True)
+def _clear_staged_diff_cache():
+    """Keep the staged-diff cache from leaking mocked diffs between tests."""
+    commit_module._diff_for_index.cache_clear()
+    yield
+    commit_module._diff_for_index.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_repo_cache():
+    """Tests patch ``git_utils.Repo``; don't hand out handles from earlier tests."""
+    git_utils._open_repo.cache_clear()
+    yield
+    git_utils._open_repo.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_llm_cache(tmp_path, monkeypatch):
+    """Point the on-disk LLM cache at a per-test directory."""
+    monkeypatch.setenv(
+        llm_cache.CACHE_DIR_ENV, str(tmp_path / "llm-cache")
+    )
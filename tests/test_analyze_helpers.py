@@ -4,6 +4,8 @@ from ai_toolbox.commands.review import (
     analyze_syntax,
     analyze_logic,
 )
+from ai_toolbox.tool_registry import ToolDescriptor
+from ai_toolbox.tool_utils import TOOL_REGISTRY
 
 
 class DummyMessage:
@@ -83,3 +85,162 @@ def test_analyze_helpers_skip_when_no_model():
     assert logic_result.summary == "No model provided - skipping review"
     assert logic_result.issues == []
     assert logic_result.suggestions == []
+
+
+class DummyFunction:
+    def __init__(self, name, arguments):
+        self.name = name
+        self.arguments = arguments
+
+
+class DummyToolCall:
+    def __init__(self, call_id, name, arguments):
+        self.id = call_id
+        self.function = DummyFunction(name, arguments)
+
+
+def _tool_call_response(*tool_calls):
+    resp = DummyResponse("")
+    resp.choices[0].message.tool_calls = list(tool_calls)
+    return resp
+
+
+def test_analyze_logic_reuses_repeated_tool_results(mocker):
+    final = DummyResponse(
+        json.dumps({"summary": "done", "issues": [], "suggestions": []})
+    )
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=[
+            _tool_call_response(
+                DummyToolCall("1", "run_pylint", '{"path": "a.py"}')
+            ),
+            _tool_call_response(
+                DummyToolCall("2", "run_pylint", '{"path": "a.py"}'),
+                DummyToolCall("3", "run_pylint", '{"path": "b.py"}'),
+            ),
+            final,
+        ],
+    )
+    call_tool = mocker.patch(
+        "ai_toolbox.tool_utils.TOOL_REGISTRY.call_tool",
+        side_effect=lambda name, **args: f"lint {args['path']}",
+    )
+
+    result = analyze_logic("+ x = 1", model="fake-model")
+
+    assert result.summary == "done"
+    assert [c.kwargs for c in call_tool.call_args_list] == [
+        {"path": "a.py"},
+        {"path": "b.py"},
+    ]
+
+
+def test_analyze_logic_does_not_reuse_non_cacheable_tools(mocker):
+    final = DummyResponse(
+        json.dumps({"summary": "done", "issues": [], "suggestions": []})
+    )
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=[
+            _tool_call_response(DummyToolCall("1", "touch", "{}")),
+            _tool_call_response(DummyToolCall("2", "touch", "{}")),
+            final,
+        ],
+    )
+    mocker.patch.dict(
+        TOOL_REGISTRY._registry,
+        {
+            "touch": ToolDescriptor(
+                name="touch",
+                func=lambda: "ok",
+                description="Has side effects",
+                params_schema={"type": "object", "properties": {}},
+                cacheable=False,
+            )
+        },
+    )
+    call_tool = mocker.patch(
+        "ai_toolbox.tool_utils.TOOL_REGISTRY.call_tool", return_value="ok"
+    )
+
+    analyze_logic("+ x = 1", model="fake-model")
+
+    assert call_tool.call_count == 2
+
+
+def test_analyze_logic_runs_turn_tool_calls_concurrently(mocker):
+    import threading
+
+    final = DummyResponse(
+        json.dumps({"summary": "done", "issues": [], "suggestions": []})
+    )
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=[
+            _tool_call_response(
+                DummyToolCall("1", "run_pylint", '{"path": "a.py"}'),
+                DummyToolCall("2", "run_pylint", '{"path": "b.py"}'),
+            ),
+            final,
+        ],
+    )
+    # Each call waits for the other; run one after the other the barrier
+    # would time out and the tools would report an error.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def call_tool(name, **args):
+        barrier.wait()
+        return f"lint {args['path']}"
+
+    mocker.patch(
+        "ai_toolbox.tool_utils.TOOL_REGISTRY.call_tool",
+        side_effect=call_tool,
+    )
+
+    analyze_logic("+ x = 1", model="fake-model")
+
+    messages = mock_completion.call_args_list[1].kwargs["messages"]
+    tool_messages = [
+        m for m in messages if isinstance(m, dict) and m["role"] == "tool"
+    ]
+    assert [(m["tool_call_id"], m["content"]) for m in tool_messages] == [
+        ("1", "lint a.py"),
+        ("2", "lint b.py"),
+    ]
+
+
+def test_analyze_logic_sends_tool_turns_as_plain_dicts(mocker):
+    final = DummyResponse(
+        json.dumps({"summary": "done", "issues": [], "suggestions": []})
+    )
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=[
+            _tool_call_response(
+                DummyToolCall("1", "run_pylint", '{"path": "a.py"}')
+            ),
+            final,
+        ],
+    )
+    mocker.patch(
+        "ai_toolbox.tool_utils.TOOL_REGISTRY.call_tool", return_value="ok"
+    )
+
+    analyze_logic("+ x = 1", model="fake-model")
+
+    assistant = mock_completion.call_args_list[1].kwargs["messages"][-2]
+    assert assistant == {
+        "role": "assistant",
+        "content": "",
+        "tool_calls": [
+            {
+                "id": "1",
+                "type": "function",
+                "function": {
+                    "name": "run_pylint",
+                    "arguments": '{"path": "a.py"}',
+                },
+            }
+        ],
+    }
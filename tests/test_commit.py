@@ -1,5 +1,6 @@
 """Tests for the commit command module."""
 
+import importlib
 import subprocess
 import pytest
 from click.testing import CliRunner
@@ -12,6 +13,27 @@ from ai_toolbox.commands.commit import (
     COMMIT_MESSAGE_PROMPT_TEMPLATE,
 )
 
+commit_module = importlib.import_module("ai_toolbox.commands.commit")
+
+
+def make_stream(*messages):
+    """Build fake streaming chunks, one candidate per message.
+
+    Each message is split into two deltas to exercise chunk accumulation.
+    """
+    chunks = []
+    for index, message in enumerate(messages):
+        pieces = (
+            [message[: len(message) // 2], message[len(message) // 2 :]]
+            if message
+            else [message]
+        )
+        for piece in pieces:
+            choice = Mock(index=index)
+            choice.delta.content = piece
+            chunks.append(Mock(choices=[choice]))
+    return chunks
+
 
 class TestGetStagedDiff:
     """Test cases for the get_staged_diff function."""
@@ -137,12 +159,7 @@ class TestCommitCommand:
         mock_completion = mocker.patch(
             "ai_toolbox.commands.commit.completion"
         )
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = (
-            generated_message
-        )
-        mock_completion.return_value = mock_response
+        mock_completion.return_value = make_stream(generated_message)
 
         # Mock subprocess.run for git commit
         mock_run = mocker.patch(
@@ -163,9 +180,10 @@ class TestCommitCommand:
         # Verify the LLM was called with correct prompt
         mock_completion.assert_called_once()
         call_args = mock_completion.call_args
-        assert len(call_args[1]["messages"]) == 1
+        assert len(call_args[1]["messages"]) == 2
+        assert call_args[1]["messages"][0]["role"] == "system"
         assert (
-            staged_diff in call_args[1]["messages"][0]["content"]
+            staged_diff in call_args[1]["messages"][1]["content"]
         )
 
         # Verify git commit was called
@@ -190,12 +208,7 @@ class TestCommitCommand:
         mock_completion = mocker.patch(
             "ai_toolbox.commands.commit.completion"
         )
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = (
-            generated_message
-        )
-        mock_completion.return_value = mock_response
+        mock_completion.return_value = make_stream(generated_message)
 
         # Mock subprocess.run for git commit (should not be called)
         mock_run = mocker.patch(
@@ -240,21 +253,9 @@ class TestCommitCommand:
         )
 
         # First call returns initial message, second call returns adjusted message
-        mock_response1 = Mock()
-        mock_response1.choices = [Mock()]
-        mock_response1.choices[0].message.content = (
-            initial_message
-        )
-
-        mock_response2 = Mock()
-        mock_response2.choices = [Mock()]
-        mock_response2.choices[0].message.content = (
-            adjusted_message
-        )
-
         mock_completion.side_effect = [
-            mock_response1,
-            mock_response2,
+            make_stream(initial_message),
+            make_stream(adjusted_message),
         ]
 
         # Mock subprocess.run for git commit
@@ -281,13 +282,13 @@ class TestCommitCommand:
         second_call_args = mock_completion.call_args_list[1]
         messages = second_call_args[1]["messages"]
         assert (
-            len(messages) == 3
-        )  # Original prompt + assistant response + user adjustment
-        assert messages[1]["role"] == "assistant"
-        assert messages[1]["content"] == initial_message
-        assert messages[2]["role"] == "user"
+            len(messages) == 4
+        )  # System + diff prompt + assistant response + user adjustment
+        assert messages[2]["role"] == "assistant"
+        assert messages[2]["content"] == initial_message
+        assert messages[3]["role"] == "user"
         assert (
-            messages[2]["content"] == "Make it more descriptive"
+            messages[3]["content"] == "Make it more descriptive"
         )
 
         # Verify git commit was called with the adjusted message
@@ -310,12 +311,7 @@ class TestCommitCommand:
         mock_completion = mocker.patch(
             "ai_toolbox.commands.commit.completion"
         )
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = (
-            generated_message
-        )
-        mock_completion.return_value = mock_response
+        mock_completion.return_value = make_stream(generated_message)
 
         # Mock subprocess.run for git commit to fail
         mock_run = mocker.patch(
@@ -414,10 +410,7 @@ class TestCommitCommand:
         mock_completion = mocker.patch(
             "ai_toolbox.commands.commit.completion"
         )
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = None
-        mock_completion.return_value = mock_response
+        mock_completion.return_value = make_stream(None)
 
         # Mock subprocess.run for git commit
         mock_run = mocker.patch(
@@ -595,14 +588,9 @@ class TestCommitCommandEdgeCases:
         mock_completion = mocker.patch(
             "ai_toolbox.commands.commit.completion"
         )
-        mock_responses = []
-        for message in messages:
-            mock_response = Mock()
-            mock_response.choices = [Mock()]
-            mock_response.choices[0].message.content = message
-            mock_responses.append(mock_response)
-
-        mock_completion.side_effect = mock_responses
+        mock_completion.side_effect = [
+            make_stream(message) for message in messages
+        ]
 
         # Mock git_utils.run_commit for git commit
         mock_run = mocker.patch(
@@ -645,12 +633,7 @@ class TestCommitCommandEdgeCases:
         mock_completion = mocker.patch(
             "ai_toolbox.commands.commit.completion"
         )
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = (
-            generated_message
-        )
-        mock_completion.return_value = mock_response
+        mock_completion.return_value = make_stream(generated_message)
 
         # Mock git_utils.run_commit for git commit
         mock_run = mocker.patch(
@@ -687,12 +670,7 @@ class TestCommitCommandEdgeCases:
         mock_completion = mocker.patch(
             "ai_toolbox.commands.commit.completion"
         )
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = (
-            generated_message
-        )
-        mock_completion.return_value = mock_response
+        mock_completion.return_value = make_stream(generated_message)
 
         # Mock git_utils.run_commit for git commit
         mock_run = mocker.patch(
@@ -712,3 +690,555 @@ class TestCommitCommandEdgeCases:
 
         # Verify git commit was called with the unicode message
         mock_run.assert_called_once_with(generated_message)
+
+
+class TestStagedDiffCache:
+    """Test cases for the staged diff cache."""
+
+    def test_get_staged_diff_reuses_diff_for_same_index(self, mocker):
+        """Repeated calls for an unchanged index only run git diff once."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_staged_fingerprint",
+            return_value="head:1:1",
+        )
+        mock_get = mocker.patch("ai_toolbox.git_utils.get_diff")
+        mock_get.return_value = "diff --git a/f b/f\n+x\n"
+
+        assert get_staged_diff() == get_staged_diff()
+        mock_get.assert_called_once()
+
+    def test_get_staged_diff_refreshes_when_index_changes(
+        self, mocker
+    ):
+        """A new fingerprint triggers a fresh git diff."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_staged_fingerprint",
+            side_effect=["head:1:1", "head:2:2"],
+        )
+        mock_get = mocker.patch("ai_toolbox.git_utils.get_diff")
+        mock_get.side_effect = ["first", "second"]
+
+        assert get_staged_diff() == "first"
+        assert get_staged_diff() == "second"
+
+    def test_get_staged_diff_keys_cache_on_repository(
+        self, mocker, tmp_path, monkeypatch
+    ):
+        """Repositories with the same fingerprint don't share a diff."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_staged_fingerprint",
+            return_value="head:1:1",
+        )
+        mock_get = mocker.patch("ai_toolbox.git_utils.get_diff")
+        mock_get.side_effect = ["first", "second"]
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+
+        monkeypatch.chdir(tmp_path / "a")
+        assert get_staged_diff() == "first"
+        monkeypatch.chdir(tmp_path / "b")
+        assert get_staged_diff() == "second"
+        assert mock_get.call_args.kwargs["path"] == str(tmp_path / "b")
+
+    def test_get_staged_diff_falls_back_without_fingerprint(
+        self, mocker
+    ):
+        """If the index can't be fingerprinted git diff is called directly."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_staged_fingerprint",
+            side_effect=FileNotFoundError("no index"),
+        )
+        mock_get = mocker.patch("ai_toolbox.git_utils.get_diff")
+        mock_get.return_value = "diff"
+
+        assert get_staged_diff() == "diff"
+        assert get_staged_diff() == "diff"
+        assert mock_get.call_count == 2
+
+
+class TestCommitCandidates:
+    """Test cases for batched commit message candidates."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.runner = CliRunner()
+
+    def _mock_candidates(self, mocker, messages):
+        mocker.patch(
+            "ai_toolbox.git_utils.get_diff",
+            return_value="diff --git a/file.txt b/file.txt\n+new line\n",
+        )
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.commit.completion"
+        )
+        mock_completion.return_value = make_stream(*messages)
+        return mock_completion
+
+    def test_commit_requests_multiple_candidates(self, mocker):
+        """A single completion call requests several candidates."""
+        mock_completion = self._mock_candidates(
+            mocker, ["feat: one", "feat: two", "feat: three"]
+        )
+        mock_run = mocker.patch("ai_toolbox.git_utils.run_commit")
+
+        result = self.runner.invoke(
+            commit,
+            input="2\n",
+            obj={"model": "openai/gpt-4o-mini"},
+        )
+
+        assert result.exit_code == 0
+        assert mock_completion.call_args[1]["n"] == 3
+        assert "1) Use candidate 1 (default)" in result.output
+        assert "4) Adjust" in result.output
+        assert "5) Abort" in result.output
+        mock_run.assert_called_once_with("feat: two")
+
+    def test_commit_candidates_and_menu_layout(self, mocker):
+        """Candidates, footer and menu are laid out line by line."""
+        self._mock_candidates(mocker, ["feat: one", "feat: two"])
+
+        result = self.runner.invoke(
+            commit,
+            input="4\n",
+            obj={"model": "openai/gpt-4o-mini"},
+        )
+
+        assert (
+            "----- Generated commit message -----\nfeat: one\n"
+            "\n----- Candidate 2 -----\nfeat: two\n"
+            "----- End commit message -----\n\n"
+            "Choose one of the following actions:\n\n"
+            "1) Use candidate 1 (default)\n"
+            "2) Use candidate 2\n"
+            "3) Adjust\n"
+            "4) Abort\n"
+        ) in result.output
+
+    def test_commit_candidates_abort(self, mocker):
+        """Choosing the last entry aborts without committing."""
+        self._mock_candidates(
+            mocker, ["feat: one", "feat: two", "feat: three"]
+        )
+        mock_run = mocker.patch("ai_toolbox.git_utils.run_commit")
+
+        result = self.runner.invoke(
+            commit,
+            input="5\n",
+            obj={"model": "openai/gpt-4o-mini"},
+        )
+
+        assert result.exit_code == 0
+        assert "Aborted..." in result.output
+        mock_run.assert_not_called()
+
+    def test_commit_candidates_adjust_sends_all_candidates(
+        self, mocker
+    ):
+        """Adjusting feeds every shown candidate back to the LLM."""
+        mock_completion = self._mock_candidates(
+            mocker, ["feat: one", "feat: two"]
+        )
+        mocker.patch("ai_toolbox.git_utils.run_commit")
+
+        result = self.runner.invoke(
+            commit,
+            input="3\nShorter please\n1\n",
+            obj={"model": "openai/gpt-4o-mini"},
+        )
+
+        assert result.exit_code == 0
+        assert mock_completion.call_count == 2
+        messages = mock_completion.call_args_list[1][1]["messages"]
+        assert "Candidate 1:\nfeat: one" in messages[2]["content"]
+        assert "Candidate 2:\nfeat: two" in messages[2]["content"]
+        assert messages[3]["content"] == "Shorter please"
+
+
+class TestCondenseDiff:
+    """Test cases for shrinking large diffs before prompting."""
+
+    def test_small_diff_is_unchanged(self):
+        """Diffs within the limits are passed through verbatim."""
+        diff = "diff --git a/a.py b/a.py\n+x = 1"
+        assert commit_module._condense_diff(diff) == diff
+
+    def test_multi_file_diff_is_unchanged(self):
+        """Splitting into file sections and rejoining is lossless."""
+        diff = (
+            "warning: preamble\n"
+            "diff --git a/a.py b/a.py\n+x = 1\n"
+            "diff --git a/b.py b/b.py\n+y = 2\n"
+        )
+        assert commit_module._condense_diff(diff) == diff
+
+    def test_generated_files_keep_only_header(self):
+        """Lockfile hunks are dropped but the file is still listed."""
+        diff = (
+            "diff --git a/a.py b/a.py\n+x = 1\n"
+            "diff --git a/poetry.lock b/poetry.lock\n"
+            + "+dep\n" * 100
+        )
+        condensed = commit_module._condense_diff(diff)
+        assert "+x = 1" in condensed
+        assert "diff --git a/poetry.lock b/poetry.lock" in condensed
+        assert "+dep" not in condensed
+
+    def test_large_file_section_is_truncated(self):
+        """Each file's diff is capped with a truncation marker."""
+        diff = "diff --git a/a.py b/a.py\n" + "+line\n" * 1000
+        condensed = commit_module._condense_diff(diff)
+        stat, _, body = condensed.partition("\n\n")
+        assert stat.endswith(" a.py | +1000 -0")
+        assert len(body) < commit_module.MAX_FILE_DIFF_CHARS + 50
+        assert "more lines truncated)" in body
+
+    def test_total_length_is_capped(self):
+        """The combined diff never exceeds the overall budget."""
+        diff = "\n".join(
+            f"diff --git a/f{i}.py b/f{i}.py\n" + "+line\n" * 50
+            for i in range(100)
+        )
+        condensed = commit_module._condense_diff(diff, max_chars=5000)
+        assert len(condensed) < 5050
+        assert condensed.endswith("more lines truncated)")
+
+    def test_files_cut_by_total_cap_are_still_listed(self):
+        """The summary names every file, even those cut from the body."""
+        diff = "\n".join(
+            f"diff --git a/f{i}.py b/f{i}.py\n+added\n-removed"
+            + "\n+line" * 50
+            for i in range(20)
+        )
+        condensed = commit_module._condense_diff(diff, max_chars=3000)
+        assert "diff --git a/f19.py" not in condensed
+        assert " f19.py | +51 -1" in condensed
+
+
+class TestFastClassify:
+    """Test cases for the local commit message heuristics."""
+
+    def test_docs_only_diff(self):
+        diff = "diff --git a/docs/cli.md b/docs/cli.md\n+text"
+        assert commit_module._fast_classify(diff) == "docs: update cli"
+
+    def test_new_readme_is_added(self):
+        diff = (
+            "diff --git a/README.md b/README.md\n"
+            "new file mode 100644\n+# Title"
+        )
+        assert commit_module._fast_classify(diff) == "docs: add README"
+
+    def test_dependency_only_diff(self):
+        diff = (
+            "diff --git a/pyproject.toml b/pyproject.toml\n+x\n"
+            "diff --git a/poetry.lock b/poetry.lock\n+y"
+        )
+        assert (
+            commit_module._fast_classify(diff)
+            == "chore(deps): update dependencies"
+        )
+
+    def test_version_bump(self):
+        diff = (
+            "diff --git a/pyproject.toml b/pyproject.toml\n"
+            "--- a/pyproject.toml\n+++ b/pyproject.toml\n"
+            "@@ -3 +3 @@\n"
+            '-version = "0.1.0"\n+version = "0.2.0"\n'
+            "diff --git a/src/pkg/__init__.py b/src/pkg/__init__.py\n"
+            '-__version__ = "0.1.0"\n+__version__ = "0.2.0"'
+        )
+        assert (
+            commit_module._fast_classify(diff)
+            == "chore: bump version to 0.2.0"
+        )
+
+    def test_version_line_outside_manifests_is_not_a_bump(self):
+        diff = (
+            "diff --git a/src/pkg/config.py b/src/pkg/config.py\n"
+            '-version = "1"\n+version = "2"'
+        )
+        assert commit_module._fast_classify(diff) is None
+
+    def test_version_change_with_other_edits_is_not_a_bump(self):
+        diff = (
+            "diff --git a/pyproject.toml b/pyproject.toml\n"
+            '-version = "0.1.0"\n+version = "0.2.0"\n'
+            '+dependencies = ["click"]'
+        )
+        assert (
+            commit_module._fast_classify(diff)
+            == "chore(deps): update dependencies"
+        )
+
+    def test_tests_only_diff(self):
+        diff = (
+            "diff --git a/tests/test_a.py b/tests/test_a.py\n+x\n"
+            "diff --git a/tests/test_b.py b/tests/test_b.py\n+y"
+        )
+        assert commit_module._fast_classify(diff) == "test: update tests"
+
+    def test_source_changes_need_the_llm(self):
+        diff = (
+            "diff --git a/src/app.py b/src/app.py\n+x\n"
+            "diff --git a/README.md b/README.md\n+y"
+        )
+        assert commit_module._fast_classify(diff) is None
+
+    def test_commit_skips_llm_for_routine_diff(self, mocker):
+        """A docs-only diff is committed without calling the LLM."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_diff",
+            return_value="diff --git a/docs/cli.md b/docs/cli.md\n+text\n",
+        )
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.commit.completion"
+        )
+        mock_run = mocker.patch("ai_toolbox.git_utils.run_commit")
+
+        result = CliRunner().invoke(
+            commit, input="1\n", obj={"model": "openai/gpt-4o-mini"}
+        )
+
+        assert result.exit_code == 0
+        mock_completion.assert_not_called()
+        mock_run.assert_called_once_with("docs: update cli")
+
+    def test_commit_adjusting_routine_message_calls_llm(self, mocker):
+        """Adjusting a locally derived message falls back to the LLM."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_diff",
+            return_value="diff --git a/docs/cli.md b/docs/cli.md\n+text\n",
+        )
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.commit.completion",
+            return_value=make_stream("docs: describe CLI options"),
+        )
+        mock_run = mocker.patch("ai_toolbox.git_utils.run_commit")
+
+        result = CliRunner().invoke(
+            commit,
+            input="2\nMention the options\n1\n",
+            obj={"model": "openai/gpt-4o-mini"},
+        )
+
+        assert result.exit_code == 0
+        mock_completion.assert_called_once()
+        messages = mock_completion.call_args[1]["messages"]
+        assert messages[-2]["content"] == "docs: update cli"
+        mock_run.assert_called_once_with("docs: describe CLI options")
+
+
+class TestAdjustConversation:
+    """Test cases for the messages sent on Adjust rounds."""
+
+    def test_repeated_adjust_only_sends_latest_turns(self, mocker):
+        """Later rounds resend the prompt plus the last exchange only."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_diff",
+            return_value="diff --git a/file.txt b/file.txt\n+new line\n",
+        )
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.commit.completion",
+            side_effect=[
+                make_stream("feat: one\n\nLong body text"),
+                make_stream("feat: two"),
+                make_stream("feat: three"),
+            ],
+        )
+        mocker.patch("ai_toolbox.git_utils.run_commit")
+
+        result = CliRunner().invoke(
+            commit,
+            input="2\nfirst\n2\nsecond\n1\n",
+            obj={"model": "openai/gpt-4o-mini"},
+        )
+
+        assert result.exit_code == 0
+        second = mock_completion.call_args_list[1][1]["messages"]
+        assert second[2]["content"] == "feat: one"
+        third = mock_completion.call_args_list[2][1]["messages"]
+        assert len(third) == 4
+        assert third[:2] == second[:2]
+        assert third[2]["content"] == "feat: two"
+        assert third[3]["content"] == "second"
+
+    def test_anthropic_prompt_is_marked_cacheable(self, mocker):
+        """Anthropic models get a cache_control marker on the prompt."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_diff",
+            return_value="diff --git a/file.txt b/file.txt\n+new line\n",
+        )
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.commit.completion",
+            return_value=make_stream("feat: one"),
+        )
+        mocker.patch("ai_toolbox.git_utils.run_commit")
+
+        CliRunner().invoke(
+            commit,
+            input="1\n",
+            obj={"model": "anthropic/claude-sonnet-4"},
+        )
+
+        content = mock_completion.call_args[1]["messages"][0]["content"]
+        assert content[0]["cache_control"] == {"type": "ephemeral"}
+
+
+class TestCommitMessageCache:
+    """Test cases for reusing messages generated for the same diff."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.runner = CliRunner()
+
+    def _invoke(
+        self,
+        mocker,
+        streams,
+        user_input,
+        args=(),
+        model="openai/gpt-4o-mini",
+    ):
+        mocker.patch(
+            "ai_toolbox.git_utils.get_diff",
+            return_value="diff --git a/file.txt b/file.txt\n+new line\n",
+        )
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.commit.completion",
+            side_effect=streams,
+        )
+        mock_run = mocker.patch("ai_toolbox.git_utils.run_commit")
+        result = self.runner.invoke(
+            commit,
+            list(args),
+            input=user_input,
+            obj={"model": model},
+        )
+        return result, mock_completion, mock_run
+
+    def test_rerun_after_abort_reuses_generated_message(self, mocker):
+        """Aborting and re-running on the same diff skips the LLM."""
+        self._invoke(mocker, [make_stream("feat: one")], "3\n")
+
+        result, mock_completion, mock_run = self._invoke(
+            mocker, [], "1\n"
+        )
+
+        assert result.exit_code == 0
+        assert "Reusing the commit message" in result.output
+        mock_completion.assert_not_called()
+        mock_run.assert_called_once_with("feat: one")
+
+    def test_approved_adjustment_is_cached(self, mocker):
+        """The approved message replaces the originally generated one."""
+        self._invoke(
+            mocker,
+            [make_stream("feat: one"), make_stream("feat: two")],
+            "2\nshorter\n1\n",
+        )
+
+        result, mock_completion, mock_run = self._invoke(
+            mocker, [], "1\n"
+        )
+
+        mock_completion.assert_not_called()
+        mock_run.assert_called_once_with("feat: two")
+
+    def test_adjust_on_cached_message_calls_llm(self, mocker):
+        """Adjusting a reused message still goes through the LLM."""
+        self._invoke(mocker, [make_stream("feat: one")], "3\n")
+
+        result, mock_completion, mock_run = self._invoke(
+            mocker, [make_stream("feat: two")], "2\nshorter\n1\n"
+        )
+
+        assert mock_completion.call_count == 1
+        mock_run.assert_called_once_with("feat: two")
+
+    def test_no_cache_flag_calls_llm(self, mocker):
+        """--no-cache ignores the cached message and regenerates."""
+        self._invoke(mocker, [make_stream("feat: one")], "3\n")
+
+        result, mock_completion, mock_run = self._invoke(
+            mocker, [make_stream("feat: two")], "1\n", args=["--no-cache"]
+        )
+
+        mock_completion.assert_called_once()
+        mock_run.assert_called_once_with("feat: two")
+
+    def test_cache_is_per_model(self, mocker):
+        """Messages cached for one model are not reused for another."""
+        self._invoke(mocker, [make_stream("feat: one")], "3\n")
+
+        result, mock_completion, mock_run = self._invoke(
+            mocker,
+            [make_stream("feat: two")],
+            "1\n",
+            model="anthropic/claude-sonnet-4",
+        )
+
+        mock_completion.assert_called_once()
+        mock_run.assert_called_once_with("feat: two")
+
+
+def test_prompt_prefix_and_suffix_match_template():
+    """Joining the split user template reproduces str.format output."""
+    diff = "diff --git a/x b/x\n+{not a field}\n"
+    assert "".join(
+        (commit_module._PROMPT_PREFIX, diff, commit_module._PROMPT_SUFFIX)
+    ) == commit_module.COMMIT_USER_PROMPT_TEMPLATE.format(diff=diff)
+
+
+def test_is_blank():
+    """Only empty or whitespace-only diffs count as blank."""
+    assert commit_module._is_blank("")
+    assert commit_module._is_blank(" \n\t\n")
+    assert not commit_module._is_blank("diff --git a/x b/x\n")
+    assert not commit_module._is_blank("\n\n+x")
+
+
+class TestNonInteractive:
+    """Test cases for the --no-interactive scripting mode."""
+
+    def test_prints_only_the_generated_message(self, mocker):
+        """Output is exactly one message; nothing is committed."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_diff",
+            return_value="diff --git a/src/a.py b/src/a.py\n+x = 1\n",
+        )
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.commit.completion",
+            return_value=make_stream("feat: add x\n\nBody"),
+        )
+        mock_run = mocker.patch("ai_toolbox.git_utils.run_commit")
+
+        result = CliRunner().invoke(
+            commit,
+            ["--no-interactive"],
+            obj={"model": "openai/gpt-4o-mini"},
+        )
+
+        assert result.exit_code == 0
+        assert result.output == "feat: add x\n\nBody\n"
+        assert mock_completion.call_args[1]["n"] == 1
+        mock_run.assert_not_called()
+
+    def test_routine_diff_skips_llm(self, mocker):
+        """Locally classified diffs print their message without the LLM."""
+        mocker.patch(
+            "ai_toolbox.git_utils.get_diff",
+            return_value="diff --git a/docs/cli.md b/docs/cli.md\n+text\n",
+        )
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.commit.completion"
+        )
+
+        result = CliRunner().invoke(
+            commit,
+            obj={"model": "openai/gpt-4o-mini"},
+            env={"AI_TOOLBOX_NO_INTERACTIVE": "1"},
+        )
+
+        assert result.output == "docs: update cli\n"
+        mock_completion.assert_not_called()
@@ -0,0 +1,39 @@
+from ai_toolbox import diff_utils
+
+
+def _file(path, body):
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n{body}"
+
+
+def test_iter_file_sections_splits_on_headers():
+    diff = "preamble\n" + _file("a.py", "+a") + "\n" + _file("b.py", "+b")
+
+    sections = list(diff_utils.iter_file_sections(diff))
+
+    assert [path for path, _ in sections] == ["", "a.py", "b.py"]
+    assert "\n".join(section for _, section in sections) == diff
+
+
+def test_split_diff_returns_small_diff_unchanged():
+    diff = _file("a.py", "+a")
+    assert diff_utils.split_diff(diff, max_chars=1000) == [diff]
+
+
+def test_split_diff_packs_whole_files_into_chunks():
+    files = [_file(f"f{i}.py", "+" + "x" * 40) for i in range(4)]
+    diff = "\n".join(files)
+
+    chunks = diff_utils.split_diff(diff, max_chars=len(files[0]) * 2 + 1)
+
+    assert chunks == ["\n".join(files[:2]), "\n".join(files[2:])]
+    assert "\n".join(chunks) == diff
+
+
+def test_split_diff_keeps_oversized_file_whole():
+    small = _file("small.py", "+s")
+    big = _file("big.py", "+" + "x" * 500)
+    diff = small + "\n" + big
+
+    chunks = diff_utils.split_diff(diff, max_chars=100)
+
+    assert chunks == [small, big]
@@ -3,26 +3,39 @@ from ai_toolbox import git_utils
 
 def test_get_diff_staged_calls_repo_git_diff(mocker):
     mock_repo = mocker.Mock()
-    mock_repo.git.diff.return_value = "STAGED_DIFF"
+    mock_repo.git.diff.return_value = b"STAGED_DIFF"
 
     mocker.patch(
         "ai_toolbox.git_utils.Repo", return_value=mock_repo
     )
     diff = git_utils.get_diff(staged=True, path=".")
     assert diff == "STAGED_DIFF"
-    mock_repo.git.diff.assert_called_with("--staged")
+    mock_repo.git.diff.assert_called_with(
+        "--staged", stdout_as_string=False
+    )
 
 
 def test_get_diff_uncommitted_calls_repo_git_diff(mocker):
     mock_repo = mocker.Mock()
-    mock_repo.git.diff.return_value = "WORKTREE_DIFF"
+    mock_repo.git.diff.return_value = b"WORKTREE_DIFF"
 
     mocker.patch(
         "ai_toolbox.git_utils.Repo", return_value=mock_repo
     )
     diff = git_utils.get_diff(staged=False, path=".")
     assert diff == "WORKTREE_DIFF"
-    mock_repo.git.diff.assert_called_with()
+    mock_repo.git.diff.assert_called_with(stdout_as_string=False)
+
+
+def test_get_diff_replaces_invalid_utf8(mocker):
+    mock_repo = mocker.Mock()
+    mock_repo.git.diff.return_value = b"+caf\xe9\n"
+
+    mocker.patch(
+        "ai_toolbox.git_utils.Repo", return_value=mock_repo
+    )
+    diff = git_utils.get_diff(staged=True, path=".")
+    assert diff == "+caf\ufffd\n"
 
 
 def test_run_commit_calls_repo_commit(mocker):
@@ -33,3 +46,36 @@ def test_run_commit_calls_repo_commit(mocker):
     )
     git_utils.run_commit("msg", path=".")
     mock_repo.git.commit.assert_called_with(m="msg")
+
+
+def test_get_staged_fingerprint_changes_when_index_changes(tmp_path):
+    from git import Repo
+
+    repo = Repo.init(tmp_path)
+    (tmp_path / "a.txt").write_text("one\n")
+    repo.index.add(["a.txt"])
+    repo.index.write()
+    before = git_utils.get_staged_fingerprint(path=str(tmp_path))
+
+    (tmp_path / "a.txt").write_text("one\ntwo\n")
+    repo.index.add(["a.txt"])
+    repo.index.write()
+    after = git_utils.get_staged_fingerprint(path=str(tmp_path))
+
+    assert before != after
+    assert after == git_utils.get_staged_fingerprint(
+        path=str(tmp_path)
+    )
+
+
+def test_repo_handle_is_reused_across_calls(mocker):
+    mock_repo = mocker.Mock()
+    mock_repo.git.diff.return_value = b"DIFF"
+    mock_cls = mocker.patch(
+        "ai_toolbox.git_utils.Repo", return_value=mock_repo
+    )
+
+    git_utils.get_diff(staged=True, path=".")
+    git_utils.run_commit("msg", path=".")
+
+    mock_cls.assert_called_once()
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from ai_toolbox import json_utils
+from ai_toolbox.commands.review import ReviewIssue, ReviewResult
+
+
+def test_roundtrip():
+    data = {"summary": "ok", "issues": [], "suggestions": ["x"]}
+    assert json_utils.loads(json_utils.dumps(data)) == data
+
+
+def test_decode_error_is_stdlib_error():
+    with pytest.raises(json.JSONDecodeError):
+        json_utils.loads("not json")
+
+
+def test_uses_orjson_when_available(monkeypatch):
+    class FakeOrjson:
+        @staticmethod
+        def dumps(obj):
+            return b'{"fast":true}'
+
+        @staticmethod
+        def loads(data):
+            return {"fast": True}
+
+    monkeypatch.setattr(json_utils, "orjson", FakeOrjson)
+
+    assert json_utils.dumps({"a": 1}) == '{"fast":true}'
+    assert json_utils.loads("{}") == {"fast": True}
+
+
+def test_stdlib_fallback_is_compact(monkeypatch):
+    monkeypatch.setattr(json_utils, "orjson", None)
+
+    assert json_utils.dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+
+
+def test_stdlib_fallback_keeps_non_ascii(monkeypatch):
+    monkeypatch.setattr(json_utils, "orjson", None)
+
+    assert json_utils.dumps({"s": "café ✓"}) == '{"s":"café ✓"}'
+
+
+def test_stdlib_fallback_encodes_dataclasses(monkeypatch):
+    monkeypatch.setattr(json_utils, "orjson", None)
+
+    result = ReviewResult(summary="ok", suggestions=["x"])
+
+    assert json.loads(json_utils.dumps(result)) == result.to_dict()
+
+
+def test_falls_back_to_stdlib_when_orjson_rejects(monkeypatch):
+    class RejectingOrjson:
+        @staticmethod
+        def dumps(obj):
+            raise TypeError("Integer exceeds 64-bit range")
+
+    monkeypatch.setattr(json_utils, "orjson", RejectingOrjson)
+
+    assert json_utils.dumps({"n": 2**70}) == f'{{"n":{2**70}}}'
+
+
+def _sample_result():
+    return ReviewResult(
+        summary="Résumé — ✓",
+        issues=[
+            ReviewIssue(
+                id="1",
+                severity="minor",
+                category="style",
+                description="Ünïcode",
+                file="a.py",
+                line=3,
+            )
+        ],
+        suggestions=["naïve"],
+    )
+
+
+def test_to_json_keeps_the_stdlib_format():
+    result = _sample_result()
+
+    # Review output is unaffected by the compact prompt encoding
+    assert result.to_json() == json.dumps(result.to_dict())
+    assert result.to_json() != json_utils.dumps(result)
+
+
+def test_orjson_wide_integers_fall_back():
+    pytest.importorskip("orjson")
+    result = _sample_result()
+    result.issues[0].line = 2**70
+
+    assert json.loads(result.to_json())["issues"][0]["line"] == 2**70
@@ -0,0 +1,43 @@
+import os
+
+from ai_toolbox import llm_cache
+
+
+def test_store_then_load_roundtrip():
+    key = llm_cache.make_key("diff")
+    llm_cache.store("commit", key, {"candidates": ["feat: x"]})
+    assert llm_cache.load("commit", key) == {"candidates": ["feat: x"]}
+
+
+def test_load_missing_entry_returns_none():
+    assert llm_cache.load("commit", llm_cache.make_key("nope")) is None
+
+
+def test_corrupt_entry_is_a_miss():
+    key = llm_cache.make_key("diff")
+    llm_cache.store("commit", key, ["ok"])
+    path = os.path.join(llm_cache.cache_dir(), "commit", f"{key}.json")
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("{not json")
+    assert llm_cache.load("commit", key) is None
+
+
+def test_make_key_separates_parts():
+    assert llm_cache.make_key("ab", "c") != llm_cache.make_key("a", "bc")
+
+
+def test_cache_dir_defaults_to_xdg_cache_home(monkeypatch, tmp_path):
+    monkeypatch.delenv(llm_cache.CACHE_DIR_ENV)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert llm_cache.cache_dir() == str(tmp_path / "ai_toolbox")
+
+
+def test_expired_entry_is_a_miss():
+    key = llm_cache.make_key("diff")
+    llm_cache.store("commit", key, ["ok"])
+    path = os.path.join(llm_cache.cache_dir(), "commit", f"{key}.json")
+    week_ago = os.stat(path).st_mtime - 8 * 24 * 60 * 60
+    os.utime(path, (week_ago, week_ago))
+
+    assert llm_cache.load("commit", key) == ["ok"]
+    assert llm_cache.load("commit", key, max_age=7 * 24 * 60 * 60) is None
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+from litellm.exceptions import AuthenticationError, RateLimitError
+
+from ai_toolbox import llm_utils
+
+
+def test_cacheable_message_plain_for_openai():
+    msg = llm_utils.cacheable_message(
+        "system", "static prompt", "openai/gpt-4o-mini"
+    )
+    assert msg == {"role": "system", "content": "static prompt"}
+
+
+def test_cacheable_message_marks_anthropic_content():
+    msg = llm_utils.cacheable_message(
+        "system", "static prompt", "anthropic/claude-sonnet-4"
+    )
+    assert msg["role"] == "system"
+    block = msg["content"][0]
+    assert block["text"] == "static prompt"
+    assert block["cache_control"] == {"type": "ephemeral"}
+
+
+def test_cli_import_does_not_load_litellm():
+    code = (
+        "import sys, ai_toolbox.main; "
+        "print('litellm' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_is_authentication_error():
+    error = AuthenticationError(
+        message="bad key", llm_provider="openai", model="gpt-4o-mini"
+    )
+    assert llm_utils.is_authentication_error(error)
+    assert not llm_utils.is_authentication_error(ValueError("x"))
+
+
+def test_is_transient_error():
+    error = RateLimitError(
+        message="slow down", llm_provider="openai", model="gpt-4o-mini"
+    )
+    assert llm_utils.is_transient_error(error)
+    assert not llm_utils.is_transient_error(
+        AuthenticationError(
+            message="bad key", llm_provider="openai", model="gpt-4o-mini"
+        )
+    )
+    assert not llm_utils.is_transient_error(ValueError("x"))
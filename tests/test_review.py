@@ -1,9 +1,11 @@
+import threading
+
 import click
 from click.testing import CliRunner
 from unittest.mock import Mock
 
 from ai_toolbox.commands import review
-from ai_toolbox.commands.review import run_review_pipeline
+from ai_toolbox.commands.review import ReviewResult, run_review_pipeline
 
 
 def test_review_command_exists():
@@ -52,3 +54,689 @@ def test_review_command_calls_git_and_outputs_preview(mocker):
     # Check for pipeline completion messages instead of specific preview text
     assert "Starting review pipeline" in result.output
     assert "Syntax analysis completed" in result.output
+
+
+def test_review_json_output_is_the_only_json_on_stdout(mocker):
+    import json
+
+    mocker.patch(
+        "ai_toolbox.commands.review.cli.get_diff",
+        return_value="diff --git a/x b/x\n+x",
+    )
+    # Compact, so the raw reply never matches the formatted document
+    reply = '{"summary":"Done","issues":[],"suggestions":[]}'
+
+    def completion(**kwargs):
+        if kwargs.get("stream"):
+            chunk = Mock()
+            chunk.choices = [Mock()]
+            chunk.choices[0].delta.content = reply
+            return iter([chunk])
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = reply
+        response.choices[0].message.tool_calls = None
+        return response
+
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=completion,
+    )
+
+    result = CliRunner().invoke(review, ["--output", "json"], obj={})
+
+    assert result.exit_code == 0
+    # The streamed raw replies went to stderr, not before the document
+    assert reply not in result.stdout
+    assert reply in result.stderr
+    document = result.stdout.rstrip("\n").rsplit("\n", 1)[-1]
+    assert json.loads(document)["summary"] == "Done"
+
+
+def test_run_review_pipeline_runs_syntax_and_logic_concurrently(mocker):
+    # Each analysis waits for the other one to start; run sequentially the
+    # barrier would time out and the pipeline would report an error.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def analysis(summary):
+        def run(diff, model=None, use_cache=True, diff_block=None):
+            barrier.wait()
+            return ReviewResult(summary=summary, issues=[], suggestions=[])
+
+        return run
+
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.analyze_syntax",
+        side_effect=analysis("syntax"),
+    )
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.analyze_logic",
+        side_effect=analysis("logic"),
+    )
+    synthesize = mocker.patch(
+        "ai_toolbox.commands.review.helpers.synthesize_perspectives"
+    )
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.self_consistency_review"
+    )
+
+    run_review_pipeline(diff="diff --git a/x b/x\n+x", model=None)
+
+    reviews = synthesize.call_args[0][0]
+    assert reviews["syntax"].summary == "syntax"
+    assert reviews["logic"].summary == "logic"
+
+
+def test_analyze_syntax_marks_system_prompt_cacheable(mocker):
+    from ai_toolbox.commands.review.helpers import analyze_syntax
+    from ai_toolbox.commands.review.prompts import SYNTAX_REVIEW_TEMPLATE
+
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion"
+    )
+    mock_resp = Mock()
+    mock_resp.choices = [Mock()]
+    mock_resp.choices[0].message.content = (
+        '{"summary": "ok", "issues": [], "suggestions": []}'
+    )
+    mock_resp.choices[0].message.tool_calls = None
+    mock_completion.return_value = mock_resp
+
+    analyze_syntax("diff --git a/x b/x\n+x", model="anthropic/claude-x")
+
+    system, user = mock_completion.call_args.kwargs["messages"]
+    assert system["role"] == "system"
+    assert system["content"] == [
+        {
+            "type": "text",
+            "text": SYNTAX_REVIEW_TEMPLATE,
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    assert user == {
+        "role": "user",
+        "content": "<diff>\ndiff --git a/x b/x\n+x\n</diff>",
+    }
+
+
+
+def test_system_prompts_are_identical_across_diffs(mocker):
+    """Only user messages vary, so providers can reuse the cached prefix."""
+    reply = '{"summary": "ok", "issues": [], "suggestions": []}'
+
+    def completion(**kwargs):
+        if kwargs.get("stream"):
+            chunk = Mock()
+            chunk.choices = [Mock()]
+            chunk.choices[0].delta.content = reply
+            return iter([chunk])
+        resp = Mock()
+        resp.choices = [Mock()]
+        resp.choices[0].message.content = reply
+        resp.choices[0].message.tool_calls = None
+        return resp
+
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=completion,
+    )
+
+    def system_prompts(diff):
+        mock_completion.reset_mock()
+        run_review_pipeline(
+            diff=diff,
+            model="anthropic/claude-x",
+            use_cache=False,
+            self_critique=True,
+        )
+        prompts = [
+            call.kwargs["messages"][0]
+            for call in mock_completion.call_args_list
+        ]
+        for prompt in prompts:
+            assert prompt["role"] == "system"
+            assert diff not in prompt["content"][0]["text"]
+        return sorted(prompt["content"][0]["text"] for prompt in prompts)
+
+    first = system_prompts("diff --git a/x b/x\n+first_change")
+    second = system_prompts("diff --git a/y b/y\n+second_change")
+
+    # syntax, logic, three personas, synthesis, self-consistency
+    assert len(first) == 7
+    assert first == second
+
+class TestReviewCache:
+    def _mock_completion(self, mocker, content):
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.review.helpers.completion"
+        )
+        mock_resp = Mock()
+        mock_resp.choices = [Mock()]
+        mock_resp.choices[0].message.content = content
+        mock_resp.choices[0].message.tool_calls = None
+        mock_completion.return_value = mock_resp
+        return mock_completion
+
+    def test_repeated_review_reuses_cached_reply(self, mocker):
+        from ai_toolbox.commands.review.helpers import analyze_syntax
+
+        mock_completion = self._mock_completion(
+            mocker, '{"summary": "ok", "issues": [], "suggestions": []}'
+        )
+
+        first = analyze_syntax("diff --git a/x b/x\n+x", model="m")
+        second = analyze_syntax("diff --git a/x b/x\n+x", model="m")
+
+        assert mock_completion.call_count == 1
+        assert first == second
+        assert second.summary == "ok"
+
+    def test_different_diff_or_model_misses(self, mocker):
+        from ai_toolbox.commands.review.helpers import analyze_syntax
+
+        mock_completion = self._mock_completion(
+            mocker, '{"summary": "ok", "issues": [], "suggestions": []}'
+        )
+
+        analyze_syntax("diff --git a/x b/x\n+x", model="m")
+        analyze_syntax("diff --git a/x b/x\n+y", model="m")
+        analyze_syntax("diff --git a/x b/x\n+x", model="other")
+
+        assert mock_completion.call_count == 3
+
+    def test_changed_max_tokens_misses(self, mocker, monkeypatch):
+        from ai_toolbox.commands.review.helpers import analyze_syntax
+
+        mock_completion = self._mock_completion(
+            mocker, '{"summary": "ok", "issues": [], "suggestions": []}'
+        )
+
+        analyze_syntax("diff --git a/x b/x\n+x", model="m")
+        monkeypatch.setenv("AI_TOOLBOX_REVIEW_MAX_TOKENS_ANALYZE", "2000")
+        analyze_syntax("diff --git a/x b/x\n+x", model="m")
+
+        assert mock_completion.call_count == 2
+        assert mock_completion.call_args.kwargs["max_tokens"] == 2000
+
+    def test_no_cache_calls_llm_again(self, mocker):
+        from ai_toolbox.commands.review.helpers import analyze_syntax
+
+        mock_completion = self._mock_completion(
+            mocker, '{"summary": "ok", "issues": [], "suggestions": []}'
+        )
+
+        analyze_syntax("diff --git a/x b/x\n+x", model="m")
+        analyze_syntax(
+            "diff --git a/x b/x\n+x", model="m", use_cache=False
+        )
+
+        assert mock_completion.call_count == 2
+
+    def test_unparsable_reply_is_not_cached(self, mocker):
+        from ai_toolbox.commands.review.helpers import analyze_syntax
+
+        mock_completion = self._mock_completion(mocker, "not json")
+
+        analyze_syntax("diff --git a/x b/x\n+x", model="m")
+        analyze_syntax("diff --git a/x b/x\n+x", model="m")
+
+        assert mock_completion.call_count == 2
+
+
+def test_run_review_pipeline_skips_whitespace_only_diff(mocker):
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion"
+    )
+
+    result = run_review_pipeline(diff="\n  \n", model="fake-model")
+
+    assert result.summary == "No diff provided - skipping review"
+    mock_completion.assert_not_called()
+
+
+def test_run_review_pipeline_reviews_large_diff_in_chunks(mocker):
+    from ai_toolbox.commands.review import helpers
+
+    mocker.patch.object(helpers, "REVIEW_CHUNK_CHARS", 60)
+
+    def phase(name):
+        def run(diff, *args, **kwargs):
+            return ReviewResult(
+                summary=f"{name}:{diff.split()[2]}", issues=[], suggestions=[]
+            )
+
+        return run
+
+    mocker.patch.object(
+        helpers, "analyze_syntax", side_effect=phase("syntax")
+    )
+    mocker.patch.object(helpers, "analyze_logic", side_effect=phase("logic"))
+    mocker.patch.object(
+        helpers, "run_persona_review", side_effect=phase("persona")
+    )
+    synthesize = mocker.patch.object(helpers, "synthesize_perspectives")
+    mocker.patch.object(helpers, "self_consistency_review")
+
+    diff = (
+        "diff --git a/one.py b/one.py\n+" + "1" * 40 + "\n"
+        "diff --git a/two.py b/two.py\n+" + "2" * 40
+    )
+    run_review_pipeline(diff=diff, model="fake-model")
+
+    reviews = synthesize.call_args[0][0]
+    assert len(reviews) == 2 * 5
+    assert reviews["syntax (part 1/2)"].summary == "syntax:a/one.py"
+    assert reviews["logic (part 2/2)"].summary == "logic:a/two.py"
+    assert reviews["security (part 2/2)"].summary == "persona:a/two.py"
+
+
+class TestReviewRetries:
+    def _ok_response(self):
+        mock_resp = Mock()
+        mock_resp.choices = [Mock()]
+        mock_resp.choices[0].message.content = (
+            '{"summary": "ok", "issues": [], "suggestions": []}'
+        )
+        mock_resp.choices[0].message.tool_calls = None
+        return mock_resp
+
+    def test_transient_error_is_retried(self, mocker):
+        from litellm.exceptions import RateLimitError
+        from ai_toolbox.commands.review.helpers import analyze_syntax
+
+        sleep = mocker.patch("ai_toolbox.commands.review.helpers.time.sleep")
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.review.helpers.completion",
+            side_effect=[
+                RateLimitError(
+                    message="slow down", llm_provider="openai", model="m"
+                ),
+                self._ok_response(),
+            ],
+        )
+
+        result = analyze_syntax("diff --git a/x b/x\n+x", model="m")
+
+        assert result.summary == "ok"
+        assert mock_completion.call_count == 2
+        sleep.assert_called_once()
+
+    def test_persistent_transient_error_gives_up(self, mocker):
+        from litellm.exceptions import RateLimitError
+        from ai_toolbox.commands.review import helpers
+
+        mocker.patch("ai_toolbox.commands.review.helpers.time.sleep")
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.review.helpers.completion",
+            side_effect=RateLimitError(
+                message="slow down", llm_provider="openai", model="m"
+            ),
+        )
+
+        result = helpers.analyze_syntax("diff --git a/x b/x\n+x", model="m")
+
+        assert mock_completion.call_count == helpers.LLM_MAX_RETRIES + 1
+        assert result.issues[0].category == "unknown"
+
+    def test_other_errors_are_not_retried(self, mocker):
+        from ai_toolbox.commands.review.helpers import analyze_syntax
+
+        sleep = mocker.patch("ai_toolbox.commands.review.helpers.time.sleep")
+        mock_completion = mocker.patch(
+            "ai_toolbox.commands.review.helpers.completion",
+            side_effect=ValueError("bad request"),
+        )
+
+        analyze_syntax("diff --git a/x b/x\n+x", model="m")
+
+        assert mock_completion.call_count == 1
+        sleep.assert_not_called()
+
+
+def test_streamed_synthesis_is_echoed_and_parsed(mocker, capsys):
+    from ai_toolbox.commands.review.helpers import synthesize_perspectives
+
+    def chunk(text):
+        c = Mock()
+        c.choices = [Mock()]
+        c.choices[0].delta.content = text
+        return c
+
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        return_value=iter(
+            [
+                chunk('{"summary": "syn'),
+                chunk('th", "issues": [], "suggestions": []}'),
+            ]
+        ),
+    )
+
+    result = synthesize_perspectives(
+        {"syntax": ReviewResult(summary="s")}, model="m", stream=True
+    )
+
+    assert result.summary == "synth"
+    assert mock_completion.call_args.kwargs["stream"] is True
+    assert (
+        '{"summary": "synth", "issues": [], "suggestions": []}\n'
+        in capsys.readouterr().err
+    )
+
+
+
+def test_streamed_reply_stops_once_json_is_complete(mocker, capsys):
+    from ai_toolbox.commands.review.helpers import synthesize_perspectives
+
+    def chunk(text):
+        c = Mock()
+        c.choices = [Mock()]
+        c.choices[0].delta.content = text
+        return c
+
+    def stream():
+        # Braces inside strings must not end the object early
+        yield chunk('{"summary": "a } b", "issues": [], ')
+        yield chunk('"suggestions": ["{x}"]}')
+        raise AssertionError("read past the end of the JSON reply")
+
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        return_value=stream(),
+    )
+
+    result = synthesize_perspectives(
+        {"syntax": ReviewResult(summary="s")}, model="m", stream=True
+    )
+
+    assert result.summary == "a } b"
+    assert result.suggestions == ["{x}"]
+    assert capsys.readouterr().err.endswith('["{x}"]}\n')
+
+
+def test_streamed_prose_is_parsed_only_when_an_object_closes(
+    mocker, capsys
+):
+    from ai_toolbox import llm_requests
+
+    def chunk(text):
+        c = Mock()
+        c.choices = [Mock()]
+        c.choices[0].delta.content = text
+        return c
+
+    is_json = mocker.spy(llm_requests, "is_json")
+    chunks = ["Use {x} here. ", "} stray ", "more ", "prose"]
+
+    text = llm_requests.stream_to_stderr(iter([chunk(c) for c in chunks]))
+
+    assert text == "".join(chunks)
+    # Only the chunk closing "{x}" triggers a parse attempt
+    is_json.assert_called_once_with("Use {x} here. ")
+
+
+class TestReviewMaxTokens:
+    def _mock_completion(self, mocker):
+        mock_resp = Mock()
+        mock_resp.choices = [Mock()]
+        mock_resp.choices[0].message.content = (
+            '{"summary": "ok", "issues": [], "suggestions": []}'
+        )
+        mock_resp.choices[0].message.tool_calls = None
+        return mocker.patch(
+            "ai_toolbox.commands.review.helpers.completion",
+            return_value=mock_resp,
+        )
+
+    def test_phases_pass_their_token_cap(self, mocker):
+        from ai_toolbox.commands.review.helpers import (
+            REVIEW_MAX_TOKENS,
+            analyze_syntax,
+            run_persona_review,
+        )
+
+        mock_completion = self._mock_completion(mocker)
+
+        analyze_syntax("diff --git a/x b/x\n+x", model="m")
+        assert (
+            mock_completion.call_args.kwargs["max_tokens"]
+            == REVIEW_MAX_TOKENS["analyze"]
+        )
+
+        run_persona_review(
+            "diff --git a/x b/x\n+x", "persona", "security", model="m"
+        )
+        assert (
+            mock_completion.call_args.kwargs["max_tokens"]
+            == REVIEW_MAX_TOKENS["persona"]
+        )
+
+    def test_env_var_overrides_token_cap(self, mocker, monkeypatch):
+        from ai_toolbox.commands.review.helpers import analyze_syntax
+
+        monkeypatch.setenv("AI_TOOLBOX_REVIEW_MAX_TOKENS_ANALYZE", "2000")
+        mock_completion = self._mock_completion(mocker)
+
+        analyze_syntax("diff --git a/x b/x\n+x", model="m")
+
+        assert mock_completion.call_args.kwargs["max_tokens"] == 2000
+
+
+class TestDiffTokenBudget:
+    def test_small_diff_is_not_tokenized(self, mocker):
+        from ai_toolbox.commands.review import diff_budget
+
+        count = mocker.patch.object(diff_budget, "count_tokens")
+
+        assert diff_budget.fit_diff_to_budget("abc", "m", 100) == "abc"
+        count.assert_not_called()
+
+    def test_large_diff_keeps_head_and_tail(self, mocker):
+        from ai_toolbox.commands.review import diff_budget
+
+        # One token per character keeps the arithmetic easy to follow
+        mocker.patch.object(
+            diff_budget, "count_tokens", side_effect=lambda model, text: len(text)
+        )
+        lines = [f"line{i:02d}" for i in range(40)]
+        diff = "\n".join(lines)
+
+        fitted = diff_budget.fit_diff_to_budget(diff, "m", 100)
+
+        assert len(fitted) <= 100
+        fitted_lines = fitted.split("\n")
+        keep = (len(fitted_lines) - 1) // 2
+        assert fitted_lines[:keep] == lines[:keep]
+        assert fitted_lines[-keep:] == lines[-keep:]
+        assert fitted_lines[keep] == f"... <{40 - 2 * keep} lines omitted> ..."
+
+    def test_fitted_diff_is_memoised_across_runs(self, mocker):
+        from ai_toolbox.commands.review import diff_budget
+
+        mocker.patch.object(diff_budget, "REVIEW_DIFF_TOKEN_BUDGET", 100)
+        window = mocker.patch.object(
+            diff_budget, "max_input_tokens", return_value=None
+        )
+        count = mocker.patch.object(
+            diff_budget, "count_tokens", side_effect=lambda model, text: len(text)
+        )
+        diff = "\n".join(f"line{i:02d}" for i in range(40))
+
+        first = diff_budget.budgeted_diff(diff, "m")
+        calls = count.call_count
+        second = diff_budget.budgeted_diff(diff, "m")
+
+        assert count.call_count == calls
+        window.assert_called_once()
+        assert second == first == diff_budget.fit_diff_to_budget(diff, "m", 100)
+
+        diff_budget.budgeted_diff(diff, "m", use_cache=False)
+        assert window.call_count == 2
+
+    def test_budget_follows_small_context_windows(self, mocker):
+        from ai_toolbox.commands.review import diff_budget
+
+        mocker.patch.object(diff_budget, "max_input_tokens", return_value=16_000)
+        assert diff_budget.diff_token_budget("small") == 8_000
+
+        mocker.patch.object(diff_budget, "max_input_tokens", return_value=None)
+        assert (
+            diff_budget.diff_token_budget("unknown")
+            == diff_budget.REVIEW_DIFF_TOKEN_BUDGET
+        )
+
+
+def test_run_review_pipeline_runs_all_five_phases_at_once(mocker):
+    # Analyses and persona reviews wait for each other; unless all five
+    # run at the same time the barrier times out.
+    barrier = threading.Barrier(5, timeout=5)
+
+    def phase(diff, *args, **kwargs):
+        barrier.wait()
+        return ReviewResult(summary="ok", issues=[], suggestions=[])
+
+    for name in ("analyze_syntax", "analyze_logic", "run_persona_review"):
+        mocker.patch(
+            f"ai_toolbox.commands.review.helpers.{name}", side_effect=phase
+        )
+    synthesize = mocker.patch(
+        "ai_toolbox.commands.review.helpers.synthesize_perspectives"
+    )
+
+    run_review_pipeline(diff="diff --git a/x b/x\n+x", model=None)
+
+    reviews = synthesize.call_args[0][0]
+    assert list(reviews) == [
+        "performance",
+        "maintainability",
+        "security",
+        "syntax",
+        "logic",
+    ]
+
+
+def test_phases_share_one_wrapped_diff(mocker):
+    from ai_toolbox.commands.review import helpers
+
+    mock_resp = Mock()
+    mock_resp.choices = [Mock()]
+    mock_resp.choices[0].message.content = "not json"
+    mock_resp.choices[0].message.tool_calls = None
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        return_value=mock_resp,
+    )
+    diff = "diff --git a/x b/x\n+x"
+
+    futures = helpers._submit_review_phases(diff, "m", use_cache=False)
+    for future in futures.values():
+        future.result()
+
+    blocks = [
+        call.kwargs["messages"][1]["content"]
+        for call in mock_completion.call_args_list
+    ]
+    assert len(blocks) == 5
+    assert blocks[0] == f"<diff>\n{diff}\n</diff>"
+    assert all(block is blocks[0] for block in blocks)
+    # Nothing is kept alive after the run
+    assert not hasattr(helpers._diff_block, "cache_info")
+
+
+def test_parse_review_response_fills_defaults_and_ignores_extra_keys():
+    from ai_toolbox.commands.review.parsing import parse_review_response
+
+    result = parse_review_response(
+        '{"summary": "s", "issues": ['
+        '{"description": "d", "line": 3},'
+        '{"id": "x", "severity": "major", "confidence": 0.9}'
+        "]}"
+    )
+
+    first, second = result.issues
+    assert (first.id, first.severity, first.description, first.line) == (
+        "",
+        "info",
+        "d",
+        3,
+    )
+    assert (second.id, second.severity, second.description) == (
+        "x",
+        "major",
+        "",
+    )
+    assert result.suggestions == []
+
+
+def test_parse_review_response_interns_severity_and_category():
+    import sys
+
+    from ai_toolbox.commands.review.parsing import parse_review_response
+
+    result = parse_review_response(
+        '{"summary": "s", "issues": ['
+        '{"severity": "major", "category": "logic"},'
+        '{"severity": "major", "category": "logic"}'
+        "]}"
+    )
+
+    first, second = result.issues
+    assert first.severity is second.severity is sys.intern("major")
+    assert first.category is second.category is sys.intern("logic")
+
+
+def test_parse_review_response_reports_parse_errors(caplog):
+    from ai_toolbox.commands.review.parsing import parse_review_response
+
+    malformed = parse_review_response("{not json", "syntax")
+    unexpected = parse_review_response('{"issues": [1]}', "logic")
+
+    assert malformed.summary.startswith("Failed to parse JSON for syntax: ")
+    assert unexpected.summary.startswith(
+        "Unexpected error parsing review response for logic: "
+    )
+    for result in (malformed, unexpected):
+        (issue,) = result.issues
+        assert (issue.severity, issue.category) == ("major", "parsing")
+    # Only the unexpected failure is worth a traceback
+    assert [record.exc_info is not None for record in caplog.records] == [
+        False,
+        True,
+    ]
+
+
+def test_pipeline_reports_each_phase_as_it_finishes(mocker, capsys):
+    import threading
+
+    from ai_toolbox.commands.review import helpers
+
+    syntax_reported = threading.Event()
+    echo = helpers.click.echo
+
+    def record_echo(message="", *args, **kwargs):
+        echo(message, *args, **kwargs)
+        if message == "  ✓ syntax finished":
+            syntax_reported.set()
+
+    def slow_logic(diff, model=None, use_cache=True, diff_block=None):
+        # Finishes only after the syntax phase has been reported
+        assert syntax_reported.wait(5)
+        return ReviewResult(summary="logic")
+
+    mocker.patch.object(helpers.click, "echo", side_effect=record_echo)
+    mocker.patch.object(helpers, "analyze_logic", side_effect=slow_logic)
+
+    run_review_pipeline(diff="diff --git a/x b/x\n+x")
+
+    out = capsys.readouterr().out
+    finished = [
+        line.split()[1] for line in out.splitlines() if "finished" in line
+    ]
+    assert sorted(finished) == sorted(
+        ["syntax", "logic", "performance", "maintainability", "security"]
+    )
+    # Logic can only finish once syntax has been reported as finished
+    assert finished.index("syntax") < finished.index("logic")
+    assert out.index("✓ logic finished") < out.index(
+        "✅ Syntax analysis completed"
+    )
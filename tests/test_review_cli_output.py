@@ -14,6 +14,24 @@ def make_mock_response(text):
     return mock_resp
 
 
+def make_stream_response(text):
+    chunk = Mock()
+    chunk.choices = [Mock()]
+    chunk.choices[0].delta.content = text
+    return iter([chunk])
+
+
+def respond_with(text):
+    """Completion side effect serving both plain and streamed calls."""
+
+    def respond(**kwargs):
+        if kwargs.get("stream"):
+            return make_stream_response(text)
+        return make_mock_response(text)
+
+    return respond
+
+
 def test_review_cli_outputs_markdown(mocker):
     sample_diff = "x" * 50
     mocker.patch(
@@ -48,7 +66,7 @@ def test_review_cli_outputs_json_to_file(mocker, tmp_path):
     mock_completion = mocker.patch(
         "ai_toolbox.commands.review.helpers.completion"
     )
-    mock_completion.return_value = make_mock_response(
+    mock_completion.side_effect = respond_with(
         json.dumps(
             {"summary": "J", "issues": [], "suggestions": []}
         )
@@ -41,3 +41,65 @@ def test_markdown_no_issues_or_suggestions():
     result_markdown = result.to_markdown()
     assert "No issues found" in result_markdown
     assert "No suggestions" in result_markdown
+
+
+def test_markdown_layout():
+    result = ReviewResult(
+        summary="Looks fine",
+        issues=[
+            ReviewIssue(
+                id="1",
+                severity="minor",
+                category="style",
+                description="Long line",
+                file="a.py",
+                line=0,
+            ),
+            ReviewIssue(
+                id="2",
+                severity="info",
+                category="docs",
+                description="Missing docstring",
+                file="b.py",
+            ),
+            ReviewIssue(
+                id="3", severity="major", category="logic", description="Bug"
+            ),
+        ],
+        suggestions=["Split the function"],
+    )
+
+    assert result.to_markdown() == (
+        "# Review Summary\n"
+        "\n"
+        "Looks fine\n"
+        "\n"
+        "## Issues (3)\n"
+        "\n"
+        "- **minor**: Long line (a.py:0)\n"
+        "- **info**: Missing docstring (b.py)\n"
+        "- **major**: Bug\n"
+        "\n"
+        "## Suggestions\n"
+        "\n"
+        "- Split the function"
+    )
+
+
+def test_review_result_factory():
+    from ai_toolbox.commands.review.interfaces import review_result_factory
+
+    auth = review_result_factory("auth-error", error_message="bad key")
+    assert auth.summary == "Authentication error - skipping review: bad key"
+    assert auth.issues[0].category == "authentication"
+    assert auth.issues[0].description == "Authentication failed: bad key"
+
+    generic = review_result_factory("generic-error", error_message="boom")
+    assert generic.summary == "Generic error - skipping review: boom"
+    assert generic.issues[0].description == "Unexpected error: boom"
+
+    # Results are mutable, so every call builds a new one
+    assert review_result_factory("no-model") is not review_result_factory(
+        "no-model"
+    )
+    assert review_result_factory("unknown") is None
@@ -1,5 +1,7 @@
 import json
+import threading
 from unittest.mock import Mock
+
 from ai_toolbox.commands.review import (
     run_reviews_with_personas,
     synthesize_perspectives,
@@ -150,3 +152,323 @@ def test_pipeline_skips_llm_when_no_model():
     assert (
         refined.summary == "No model provided - skipping review"
     )
+
+
+def test_run_reviews_with_personas_runs_concurrently(mocker):
+    # Each persona waits for the others to start; run sequentially the
+    # barrier would time out and raise BrokenBarrierError.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def persona_review(
+        diff,
+        template,
+        persona_name,
+        model=None,
+        use_cache=True,
+        diff_block=None,
+    ):
+        barrier.wait()
+        return ReviewResult(
+            summary=persona_name, issues=[], suggestions=[]
+        )
+
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.run_persona_review",
+        side_effect=persona_review,
+    )
+
+    reviews = run_reviews_with_personas(
+        "diff",
+        model="fake-model",
+        personas_dict={
+            "performance": "performance",
+            "maintainability": "maintainability",
+            "security": "security",
+        },
+    )
+
+    assert list(reviews) == ["performance", "maintainability", "security"]
+    assert [r.summary for r in reviews.values()] == list(reviews)
+
+
+def test_persona_progress_is_printed_after_submission(mocker):
+    from concurrent.futures import Future
+
+    events = []
+
+    class RecordingExecutor:
+        def submit(self, fn, *args, **kwargs):
+            events.append(f"submit {kwargs['persona_name']}")
+            future = Future()
+            future.set_result(
+                ReviewResult(summary="", issues=[], suggestions=[])
+            )
+            return future
+
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers._llm_executor",
+        return_value=RecordingExecutor(),
+    )
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.click.echo",
+        side_effect=lambda message: events.append("echo"),
+    )
+
+    run_reviews_with_personas(
+        "diff",
+        model="fake-model",
+        personas_dict={"performance": "p", "security": "s"},
+    )
+
+    # No progress line is written until both requests have been handed off.
+    assert events == [
+        "submit performance",
+        "submit security",
+        "echo",
+        "echo",
+    ]
+
+
+def test_inflight_limit_caps_concurrent_llm_requests(mocker, monkeypatch):
+    from ai_toolbox import llm_requests
+
+    monkeypatch.setenv("AI_TOOLBOX_LLM_INFLIGHT_LIMIT", "1")
+    llm_requests.inflight_semaphore.cache_clear()
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def completion(**kwargs):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        threading.Event().wait(0.02)
+        with lock:
+            active.pop()
+        return make_mock_response(
+            json.dumps({"summary": "ok", "issues": [], "suggestions": []})
+        )
+
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=completion,
+    )
+    try:
+        run_reviews_with_personas(
+            "diff",
+            model="fake-model",
+            personas_dict={"a": "a", "b": "b", "c": "c"},
+        )
+    finally:
+        llm_requests.inflight_semaphore.cache_clear()
+
+    assert len(peak) == 3
+    assert max(peak) == 1
+
+
+def test_streamed_reply_holds_inflight_slot_until_done(mocker, monkeypatch):
+    from ai_toolbox import llm_requests
+    from ai_toolbox.commands.review import helpers
+
+    monkeypatch.setenv("AI_TOOLBOX_LLM_INFLIGHT_LIMIT", "1")
+    llm_requests.inflight_semaphore.cache_clear()
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=lambda **kwargs: iter(["a", "b"]),
+    )
+
+    def slot_is_free():
+        semaphore = llm_requests.inflight_semaphore()
+        if not semaphore.acquire(blocking=False):
+            return False
+        semaphore.release()
+        return True
+
+    try:
+        exhausted = helpers._completion_with_retry("synthesis", stream=True)
+        assert not slot_is_free()
+        assert list(exhausted) == ["a", "b"]
+        assert slot_is_free()
+
+        closed = helpers._completion_with_retry("synthesis", stream=True)
+        chunks = iter(closed)
+        assert next(chunks) == "a"
+        assert not slot_is_free()
+        closed.close()
+        assert slot_is_free()
+    finally:
+        llm_requests.inflight_semaphore.cache_clear()
+
+
+def test_synthesis_payload_layout(mocker):
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        return_value=make_mock_response(
+            json.dumps({"summary": "s", "issues": [], "suggestions": []})
+        ),
+    )
+    reviews = {
+        "performance": ReviewResult(summary="p"),
+        "security": ReviewResult(summary="s", suggestions=["fix"]),
+    }
+
+    synthesize_perspectives(reviews, model="fake-model")
+
+    user_message = mock_completion.call_args.kwargs["messages"][1]
+    assert user_message["content"] == (
+        "<reviews>\n"
+        '{"PERFORMANCE":{"summary":"p","issues":[],"suggestions":[]},'
+        '"SECURITY":{"summary":"s","issues":[],"suggestions":["fix"]}}'
+        "\n</reviews>"
+    )
+
+
+def test_synthesis_payload_drops_duplicate_issues(mocker):
+    from ai_toolbox.commands.review import ReviewIssue
+
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        return_value=make_mock_response(
+            json.dumps({"summary": "s", "issues": [], "suggestions": []})
+        ),
+    )
+
+    def issue(category, description, line=3):
+        return ReviewIssue(
+            id="",
+            severity="minor",
+            category=category,
+            description=description,
+            file="a.py",
+            line=line,
+        )
+
+    reviews = {
+        "syntax": ReviewResult(
+            summary="s", issues=[issue("style", "Unused import os")]
+        ),
+        "maintainability": ReviewResult(
+            summary="m",
+            issues=[
+                issue("cleanup", "Unused import os "),
+                issue("cleanup", "Unused import os", line=4),
+            ],
+        ),
+    }
+
+    synthesize_perspectives(reviews, model="fake-model")
+
+    content = mock_completion.call_args.kwargs["messages"][1]["content"]
+    payload = json.loads(content.split("\n")[1])
+    assert [i["line"] for i in payload["MAINTAINABILITY"]["issues"]] == [4]
+    assert content.endswith(
+        "(1 duplicate issue(s) already listed by an earlier review were "
+        "omitted)\n</reviews>"
+    )
+
+
+def test_run_batched_persona_review_sends_diff_once(mocker):
+    from ai_toolbox.commands.review import run_batched_persona_review
+
+    reply = {
+        "performance": {"summary": "perf", "issues": [], "suggestions": []},
+        "security": {"summary": "sec", "issues": [], "suggestions": ["x"]},
+    }
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        return_value=make_mock_response(json.dumps(reply)),
+    )
+
+    reviews = run_batched_persona_review(
+        "diff --git a/x b/x\n+x",
+        {
+            "performance": "PERF PROMPT",
+            "security": "SEC PROMPT",
+            "maintainability": "MAINT PROMPT",
+        },
+        model="fake-model",
+    )
+
+    mock_completion.assert_called_once()
+    system, user = mock_completion.call_args.kwargs["messages"]
+    assert '<persona name="security">\nSEC PROMPT\n</persona>' in str(
+        system["content"]
+    )
+    assert user["content"] == "<diff>\ndiff --git a/x b/x\n+x\n</diff>"
+    assert list(reviews) == ["performance", "security", "maintainability"]
+    assert reviews["performance"].summary == "perf"
+    assert reviews["security"].suggestions == ["x"]
+    (missing,) = reviews["maintainability"].issues
+    assert missing.category == "parsing"
+
+
+def test_pipeline_batch_personas_uses_one_persona_request(mocker):
+    from ai_toolbox.commands.review import helpers, run_review_pipeline
+
+    persona_reply = {
+        name: {"summary": name, "issues": [], "suggestions": []}
+        for name in ("performance", "maintainability", "security")
+    }
+    plain_reply = json.dumps({"summary": "s", "issues": [], "suggestions": []})
+
+    def completion(**kwargs):
+        system = str(kwargs["messages"][0]["content"])
+        text = (
+            json.dumps(persona_reply)
+            if "panel of specialist code reviewers" in system
+            else plain_reply
+        )
+        if kwargs.get("stream"):
+            chunk = Mock()
+            chunk.choices = [Mock()]
+            chunk.choices[0].delta.content = text
+            return iter([chunk])
+        return make_mock_response(text)
+
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=completion,
+    )
+    synthesize = mocker.spy(helpers, "synthesize_perspectives")
+
+    run_review_pipeline(
+        diff="diff --git a/x b/x\n+x", model="fake-model", batch_personas=True
+    )
+
+    # syntax, logic, one batched persona request, synthesis
+    assert mock_completion.call_count == 4
+    reviews = synthesize.call_args.args[0]
+    assert [reviews[name].summary for name in persona_reply] == list(
+        persona_reply
+    )
+
+
+def test_synthesis_skips_llm_when_every_review_failed(mocker):
+    from ai_toolbox.commands.review.interfaces import review_result_factory
+
+    mock_completion = mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        return_value=make_mock_response(
+            json.dumps({"summary": "s", "issues": [], "suggestions": []})
+        ),
+    )
+    auth_error = review_result_factory("auth-error", error_message="bad key")
+    failed = {
+        "syntax": auth_error,
+        "logic": review_result_factory("generic-error", error_message="boom"),
+        "security": review_result_factory("no-model"),
+    }
+
+    synthesis = synthesize_perspectives(failed, model="fake-model")
+    refined = self_consistency_review(synthesis, model="fake-model")
+
+    assert synthesis is auth_error
+    assert refined is auth_error
+    mock_completion.assert_not_called()
+
+    # A single real finding is enough to synthesize
+    synthesize_perspectives(
+        {**failed, "performance": ReviewResult(summary="ok")},
+        model="fake-model",
+    )
+    mock_completion.assert_called_once()
@@ -51,3 +51,14 @@ def test_review_issue_to_dict_and_review_result_to_dict():
     assert result_dict["issues"][0]["id"] == "ISSUE-1"
     # Ensure JSON serialization works for result dict
     json.dumps(result_dict)
+
+
+def test_review_types_use_slots():
+    issue = ReviewIssue(
+        id="ISSUE-1", severity="minor", category="style", description="d"
+    )
+    result = ReviewResult(summary="s", issues=[issue])
+    for obj in (ReviewRequest(diff="x"), issue, result):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.extra = 1  # type: ignore[attr-defined]
@@ -17,6 +17,13 @@ def make_mock_response(text):
     return mock_resp
 
 
+def make_stream_response(text):
+    chunk = Mock()
+    chunk.choices = [Mock()]
+    chunk.choices[0].delta.content = text
+    return iter([chunk])
+
+
 def test_self_consistency_review_and_pipeline_integration(
     mocker,
 ):
@@ -59,16 +66,40 @@ def test_self_consistency_review_and_pipeline_integration(
         make_mock_response(
             '{"summary": "sec", "issues": [], "suggestions": []}'
         ),
-        make_mock_response(
+        # Synthesis and self-consistency stream their reports
+        make_stream_response(
             '{"summary": "synth", "issues": [], "suggestions": []}'
         ),
-        make_mock_response(
+        make_stream_response(
             '{"summary": "Polished final review", "issues": [], "suggestions": []}'
         ),
     ]
 
     result = run_review_pipeline(
-        diff="x" * 300, model="fake-model"
+        diff="x" * 300, model="fake-model", self_critique=True
     )
     # The result is a ReviewResult object, check its summary
     assert result.summary == "Polished final review"
+
+
+def test_pipeline_skips_self_critique_by_default(mocker):
+    mocker.patch(
+        "ai_toolbox.commands.review.helpers.completion",
+        side_effect=lambda **kwargs: (
+            make_stream_response(
+                '{"summary": "synth", "issues": [], "suggestions": []}'
+            )
+            if kwargs.get("stream")
+            else make_mock_response(
+                '{"summary": "phase", "issues": [], "suggestions": []}'
+            )
+        ),
+    )
+    self_consistency = mocker.patch(
+        "ai_toolbox.commands.review.helpers.self_consistency_review"
+    )
+
+    result = run_review_pipeline(diff="x" * 300, model="fake-model")
+
+    assert result.summary == "synth"
+    self_consistency.assert_not_called()
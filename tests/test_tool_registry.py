@@ -63,3 +63,21 @@ def test_generate_all_tool_schemas():
     # find our tool
     names = [s["function"]["name"] for s in schemas]
     assert "alpha_tool" in names
+
+
+def test_all_tool_schemas_are_cached_until_next_registration():
+    r = ToolRegistry()
+
+    @r.register_tool(name="alpha_tool", description="alpha")
+    def alpha(x: str) -> str:
+        return x
+
+    first = r.generate_all_tool_schemas()
+    assert r.generate_all_tool_schemas() is first
+
+    @r.register_tool(name="beta_tool", description="beta")
+    def beta(x: str) -> str:
+        return x
+
+    names = [s["function"]["name"] for s in r.generate_all_tool_schemas()]
+    assert names == ["alpha_tool", "beta_tool"]